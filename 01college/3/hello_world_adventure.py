@@ -9,12 +9,22 @@ A Super Mario-style game with programming theme and procedural generation - 超
 import pygame
 import random
 import sys
+import os
 import math
 import json
+import time
+import hashlib
+import argparse
+from collections import deque
 from enum import Enum
 from typing import List, Tuple, Optional
 from dataclasses import dataclass
 
+try:
+    import numpy as np
+except ImportError:  # sound effects are synthesized with NumPy; without it the game runs silent
+    np = None
+
 # Initialize Pygame
 pygame.init()
 pygame.mixer.init()
@@ -23,11 +33,32 @@ pygame.mixer.init()
 SCREEN_WIDTH = 1024
 SCREEN_HEIGHT = 768
 FPS = 60
+TICK_RATE = FPS  # physics constants below are per tick, and the simulation always ticks at this rate
+TICK_SECONDS = 1 / TICK_RATE
+MAX_CATCH_UP_TICKS = 5  # ticks per rendered frame before the game slows down instead
+MAX_RENDER_FPS = 144
 GRAVITY = 0.8
 JUMP_STRENGTH = -15
 DOUBLE_JUMP_STRENGTH = -12
 MOVE_SPEED = 5
 MAX_HEALTH = 3
+PERF_WINDOW = 300  # frames kept per phase for rolling percentiles
+PERF_OVERLAY_REFRESH = 30  # frames between perf overlay redraws
+GLOW_STEP = 0.5  # item glow sizes are baked in half-pixel steps
+CODE_SYMBOLS = ["{", "}", "(", ")", ";", "//"]
+CODE_CELL_SIZE = (30, 40)
+CODE_DENSITY = 0.1  # share of background cells showing a symbol
+CODE_FLICKER_RATE = 120  # background cells re-rolled per second
+SOUND_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".sound_cache")
+
+# Sound effect parameters: waveform, start and end frequency (Hz), duration (s),
+# volume, attack and release (s)
+SOUND_EFFECTS = {
+    "jump": ("square", 400, 700, 0.1, 0.25, 0.005, 0.05),
+    "damage": ("noise", 300, 80, 0.25, 0.35, 0.002, 0.15),
+    "pickup": ("sine", 880, 1320, 0.15, 0.3, 0.005, 0.08),
+}
+MAX_PARTICLES = 600  # live particle cap; the oldest are evicted first
 
 # Colors (Programming Theme)
 BLACK = (0, 0, 0)
@@ -127,6 +158,20 @@ class EnemyType(Enum):
     RUNTIME_BUG = 2
     LOGIC_VIRUS = 3
 
+ITEM_NAMES = {
+    ItemType.DEBUG_POTION: CN.DEBUG_POTION,
+    ItemType.CODE_BOOST: CN.CODE_BOOST,
+    ItemType.MEMORY_UPGRADE: CN.MEMORY_UPGRADE,
+    ItemType.JUMP_EXTENSION: CN.JUMP_EXTENSION,
+    ItemType.HEALTH_PACK: CN.HEALTH_PACK,
+}
+
+ENEMY_NAMES = {
+    EnemyType.SYNTAX_ERROR: CN.SYNTAX_ERROR,
+    EnemyType.RUNTIME_BUG: CN.RUNTIME_BUG,
+    EnemyType.LOGIC_VIRUS: CN.LOGIC_VIRUS,
+}
+
 @dataclass
 class Particle:
     x: float
@@ -137,10 +182,198 @@ class Particle:
     lifetime: int
     size: int
 
+class FrameProfiler:
+    def __init__(self, window=PERF_WINDOW):
+        self.window = window
+        self.samples = {}
+        self.current = {}
+        self.counts = {}
+        self.frame = 0
+        self.last_time = time.perf_counter()
+        self.log_file = None
+        self.font = None
+        self.overlay = None
+        self.overlay_frame = -PERF_OVERLAY_REFRESH
+
+    def open_log(self, path):
+        self.log_file = open(path, "a", encoding="utf-8")
+
+    def close_log(self):
+        if self.log_file:
+            self.log_file.close()
+            self.log_file = None
+
+    def begin_frame(self):
+        self.current = {}
+        self.last_time = time.perf_counter()
+
+    def lap(self, phase):
+        # Charge the time since the previous lap to this phase
+        now = time.perf_counter()
+        self.current[phase] = self.current.get(phase, 0.0) + (now - self.last_time) * 1000
+        self.last_time = now
+
+    def end_frame(self, counts=None):
+        self.current["total"] = sum(self.current.values())
+        for phase, ms in self.current.items():
+            samples = self.samples.get(phase)
+            if samples is None:
+                samples = self.samples[phase] = deque(maxlen=self.window)
+            samples.append(ms)
+        self.counts = counts or {}
+
+        if self.log_file:
+            record = {"frame": self.frame, "ms": {k: round(v, 4) for k, v in self.current.items()},
+                      "counts": self.counts}
+            self.log_file.write(json.dumps(record) + "\n")
+        self.frame += 1
+
+    def percentile(self, phase, pct):
+        samples = sorted(self.samples.get(phase, ()))
+        if not samples:
+            return 0.0
+        return samples[min(len(samples) - 1, int(pct / 100 * len(samples)))]
+
+    def summary(self):
+        return {phase: (self.percentile(phase, 50), self.percentile(phase, 99)) for phase in self.samples}
+
+    def draw_overlay(self, screen, position):
+        # Percentiles are re-sorted only every few frames
+        if self.frame - self.overlay_frame >= PERF_OVERLAY_REFRESH:
+            if self.font is None:
+                self.font = pygame.font.Font(None, 18)
+            lines = [f"{'phase':<16}{'p50':>7}{'p99':>7}"]
+            for phase, (p50, p99) in self.summary().items():
+                lines.append(f"{phase:<16}{p50:7.2f}{p99:7.2f}")
+            lines.append(" ".join(f"{name}={count}" for name, count in self.counts.items()))
+
+            rendered = [self.font.render(line, True, WHITE) for line in lines]
+            width = max(text.get_width() for text in rendered) + 10
+            self.overlay = pygame.Surface((width, len(rendered) * 16 + 8), pygame.SRCALPHA)
+            self.overlay.fill((0, 0, 0, 170))
+            for i, text in enumerate(rendered):
+                self.overlay.blit(text, (5, 4 + i * 16))
+            self.overlay_frame = self.frame
+        screen.blit(self.overlay, position)
+
+class SpriteCache:
+    # Sprites and labels that never change are rendered once and reused every frame
+    def __init__(self):
+        self.font = None
+        self.glows = {}
+        self.items = {}
+        self.enemies = {}
+        self.labels = {}
+
+    def prepare(self, enemies, items):
+        # Render everything a level needs up front so its first frames don't pay for it
+        for enemy in enemies:
+            self.enemy_sprite(enemy)
+            self.enemy_label(enemy.type)
+        for item in items:
+            self.item_sprite(item.type, item.color, item.width, item.height)
+            self.item_label(item.type)
+
+    def label(self, key, text, color):
+        surface = self.labels.get(key)
+        if surface is None:
+            if self.font is None:
+                self.font = pygame.font.Font(None, 16)
+            surface = self.labels[key] = self.font.render(text, True, color)
+        return surface
+
+    def item_label(self, item_type):
+        return self.label(item_type, ITEM_NAMES[item_type], WHITE)
+
+    def enemy_label(self, enemy_type):
+        return self.label(enemy_type, ENEMY_NAMES[enemy_type], RED)
+
+    def enemy_sprite(self, enemy):
+        # Size and colour depend only on the enemy type
+        surface = self.enemies.get(enemy.type)
+        if surface is None:
+            width, height = enemy.width, enemy.height
+            surface = pygame.Surface((width, height))
+            surface.fill(enemy.color)
+            pygame.draw.rect(surface, BLACK, (0, 0, width, height), 2)
+
+            if enemy.type == EnemyType.SYNTAX_ERROR:
+                # X marks the spot
+                pygame.draw.line(surface, WHITE, (5, 5), (width-5, height-5), 2)
+                pygame.draw.line(surface, WHITE, (width-5, 5), (5, height-5), 2)
+            elif enemy.type == EnemyType.RUNTIME_BUG:
+                # Exclamation mark
+                pygame.draw.circle(surface, WHITE, (width//2, 8), 3)
+                pygame.draw.rect(surface, WHITE, (width//2 - 2, 15, 4, 8))
+            elif enemy.type == EnemyType.LOGIC_VIRUS:
+                # Target symbol
+                pygame.draw.circle(surface, WHITE, (width//2, height//2), 8, 2)
+                pygame.draw.circle(surface, WHITE, (width//2, height//2), 2)
+            self.enemies[enemy.type] = surface
+        return surface
+
+    def item_glow(self, color, glow_size, width, height):
+        # Three nested halos with per-pixel alpha; each ring's alpha is what the
+        # old stacked translucent fills added up to
+        glow_size = round(glow_size / GLOW_STEP) * GLOW_STEP
+        key = (color, glow_size, width, height)
+        surface = self.glows.get(key)
+        if surface is None:
+            surface = pygame.Surface((int(width + glow_size * 2 + 8), int(height + glow_size * 2 + 8)),
+                                     pygame.SRCALPHA)
+            for i in range(2, -1, -1):
+                cover = 1.0
+                for j in range(i, 3):
+                    cover *= 1 - (50 - j * 15) / 255
+                inset = 4 - i * 2
+                surface.fill((*color, round((1 - cover) * 255)),
+                             (inset, inset, int(width + glow_size * 2 + i * 4), int(height + glow_size * 2 + i * 4)))
+            self.glows[key] = surface
+        return surface
+
+    def item_sprite(self, item_type, color, width, height):
+        surface = self.items.get(item_type)
+        if surface is None:
+            surface = pygame.Surface((width, height))
+            surface.fill(color)
+            pygame.draw.rect(surface, WHITE, (0, 0, width, height), 2)
+
+            center_x = width // 2
+            center_y = height // 2
+            if item_type == ItemType.DEBUG_POTION:
+                # Shield icon
+                pygame.draw.polygon(surface, WHITE,
+                                  [(center_x, center_y-8), (center_x-6, center_y),
+                                   (center_x, center_y+8), (center_x+6, center_y)])
+            elif item_type == ItemType.CODE_BOOST:
+                # Lightning bolt
+                points = [(center_x-4, center_y-8), (center_x+2, center_y-2),
+                         (center_x-2, center_y+2), (center_x+4, center_y+8)]
+                pygame.draw.lines(surface, WHITE, False, points, 3)
+            elif item_type == ItemType.MEMORY_UPGRADE:
+                # Plus sign
+                pygame.draw.line(surface, WHITE, (center_x-6, center_y), (center_x+6, center_y), 3)
+                pygame.draw.line(surface, WHITE, (center_x, center_y-6), (center_x, center_y+6), 3)
+            elif item_type == ItemType.JUMP_EXTENSION:
+                # Arrow up
+                pygame.draw.polygon(surface, WHITE,
+                                  [(center_x, center_y-8), (center_x-4, center_y),
+                                   (center_x+4, center_y)])
+            elif item_type == ItemType.HEALTH_PACK:
+                # Heart shape
+                pygame.draw.circle(surface, WHITE, (center_x-4, center_y-2), 4)
+                pygame.draw.circle(surface, WHITE, (center_x+4, center_y-2), 4)
+            self.items[item_type] = surface
+        return surface
+
+sprite_cache = SpriteCache()
+
 class Player:
     def __init__(self, x, y):
         self.x = x
         self.y = y
+        self.prev_x = x  # position at the previous tick, for interpolated drawing
+        self.prev_y = y
         self.width = 30
         self.height = 40
         self.vx = 0
@@ -288,6 +521,8 @@ class Enemy:
     def __init__(self, x, y, enemy_type):
         self.x = x
         self.y = y
+        self.prev_x = x
+        self.prev_y = y
         self.type = enemy_type
         self.state = "patrol"
         self.state_timer = 0
@@ -410,45 +645,19 @@ class Enemy:
         return self.health <= 0
 
     def draw(self, screen):
-        # Enemy body
-        pygame.draw.rect(screen, self.color, (self.x, self.y, self.width, self.height))
-        pygame.draw.rect(screen, BLACK, (self.x, self.y, self.width, self.height), 2)
-
-        # Enemy type indicators
-        if self.type == EnemyType.SYNTAX_ERROR:
-            # X marks the spot
-            pygame.draw.line(screen, WHITE, (self.x+5, self.y+5), (self.x+self.width-5, self.y+self.height-5), 2)
-            pygame.draw.line(screen, WHITE, (self.x+self.width-5, self.y+5), (self.x+5, self.y+self.height-5), 2)
-        elif self.type == EnemyType.RUNTIME_BUG:
-            # Exclamation mark
-            pygame.draw.circle(screen, WHITE, (self.x + self.width//2, self.y + 8), 3)
-            pygame.draw.rect(screen, WHITE, (self.x + self.width//2 - 2, self.y + 15, 4, 8))
-        elif self.type == EnemyType.LOGIC_VIRUS:
-            # Target symbol
-            center_x = self.x + self.width//2
-            center_y = self.y + self.height//2
-            pygame.draw.circle(screen, WHITE, (center_x, center_y), 8, 2)
-            pygame.draw.circle(screen, WHITE, (center_x, center_y), 2)
+        screen.blit(sprite_cache.enemy_sprite(self), (self.x, self.y))
 
         # 显示敌人类型名称（在敌人上方）
-        enemy_name = ""
-        if self.type == EnemyType.SYNTAX_ERROR:
-            enemy_name = CN.SYNTAX_ERROR
-        elif self.type == EnemyType.RUNTIME_BUG:
-            enemy_name = CN.RUNTIME_BUG
-        elif self.type == EnemyType.LOGIC_VIRUS:
-            enemy_name = CN.LOGIC_VIRUS
-
-        # 绘制敌人名称
-        if enemy_name:
-            name_text = pygame.font.Font(None, 16).render(enemy_name, True, RED)
-            name_rect = name_text.get_rect(center=(self.x + self.width//2, self.y - 20))
-            screen.blit(name_text, name_rect)
+        name_text = sprite_cache.enemy_label(self.type)
+        name_rect = name_text.get_rect(center=(self.x + self.width//2, self.y - 20))
+        screen.blit(name_text, name_rect)
 
 class Projectile:
     def __init__(self, x, y, target_x, target_y, damage):
         self.x = x
         self.y = y
+        self.prev_x = x
+        self.prev_y = y
         self.damage = damage
         self.speed = 5
 
@@ -542,73 +751,24 @@ class Item:
 
         # Glow effect
         glow_size = 2 + math.sin(time * 0.003 + self.glow_offset) * 1
-
-        # Draw glow
-        for i in range(3):
-            alpha = 50 - i * 15
-            glow_color = (*self.color, alpha)
-            glow_rect = pygame.Rect(self.x - glow_size - i*2, bob_y - glow_size - i*2,
-                                  self.width + glow_size*2 + i*4, self.height + glow_size*2 + i*4)
-            s = pygame.Surface((glow_rect.width, glow_rect.height))
-            s.set_alpha(alpha)
-            s.fill(self.color)
-            screen.blit(s, glow_rect)
+        glow = sprite_cache.item_glow(self.color, glow_size, self.width, self.height)
+        offset = (glow.get_width() - self.width) // 2
+        screen.blit(glow, (self.x - offset, bob_y - offset))
 
         # Draw item
-        pygame.draw.rect(screen, self.color, (self.x, bob_y, self.width, self.height))
-        pygame.draw.rect(screen, WHITE, (self.x, bob_y, self.width, self.height), 2)
-
-        # Draw icon
-        center_x = self.x + self.width // 2
-        center_y = int(bob_y) + self.height // 2
-
-        if self.type == ItemType.DEBUG_POTION:
-            # Shield icon
-            pygame.draw.polygon(screen, WHITE,
-                              [(center_x, center_y-8), (center_x-6, center_y),
-                               (center_x, center_y+8), (center_x+6, center_y)])
-        elif self.type == ItemType.CODE_BOOST:
-            # Lightning bolt
-            points = [(center_x-4, center_y-8), (center_x+2, center_y-2),
-                     (center_x-2, center_y+2), (center_x+4, center_y+8)]
-            pygame.draw.lines(screen, WHITE, False, points, 3)
-        elif self.type == ItemType.MEMORY_UPGRADE:
-            # Plus sign
-            pygame.draw.line(screen, WHITE, (center_x-6, center_y), (center_x+6, center_y), 3)
-            pygame.draw.line(screen, WHITE, (center_x, center_y-6), (center_x, center_y+6), 3)
-        elif self.type == ItemType.JUMP_EXTENSION:
-            # Arrow up
-            pygame.draw.polygon(screen, WHITE,
-                              [(center_x, center_y-8), (center_x-4, center_y),
-                               (center_x+4, center_y)])
-        elif self.type == ItemType.HEALTH_PACK:
-            # Heart shape
-            pygame.draw.circle(screen, WHITE, (center_x-4, center_y-2), 4)
-            pygame.draw.circle(screen, WHITE, (center_x+4, center_y-2), 4)
+        screen.blit(sprite_cache.item_sprite(self.type, self.color, self.width, self.height), (self.x, bob_y))
 
         # 显示道具类型名称（在道具上方）
-        item_name = ""
-        if self.type == ItemType.DEBUG_POTION:
-            item_name = CN.DEBUG_POTION
-        elif self.type == ItemType.CODE_BOOST:
-            item_name = CN.CODE_BOOST
-        elif self.type == ItemType.MEMORY_UPGRADE:
-            item_name = CN.MEMORY_UPGRADE
-        elif self.type == ItemType.JUMP_EXTENSION:
-            item_name = CN.JUMP_EXTENSION
-        elif self.type == ItemType.HEALTH_PACK:
-            item_name = CN.HEALTH_PACK
-
-        # 绘制道具名称
-        if item_name:
-            name_text = pygame.font.Font(None, 16).render(item_name, True, WHITE)
-            name_rect = name_text.get_rect(center=(center_x, center_y - 25))
-            screen.blit(name_text, name_rect)
+        name_text = sprite_cache.item_label(self.type)
+        name_rect = name_text.get_rect(center=(self.x + self.width // 2, int(bob_y) + self.height // 2 - 25))
+        screen.blit(name_text, name_rect)
 
 class Platform:
     def __init__(self, x, y, width, height, platform_type="normal"):
         self.x = x
         self.y = y
+        self.prev_x = x
+        self.prev_y = y
         self.width = width
         self.height = height
         self.type = platform_type
@@ -838,66 +998,160 @@ class LevelGenerator:
         return platforms, enemies, items, traps
 
 class ParticleSystem:
-    def __init__(self):
-        self.particles = []
+    # Particles live in a preallocated ring of Particle objects kept in spawn order,
+    # so spawning, evicting the oldest and compacting out dead ones never allocate
+    def __init__(self, capacity=MAX_PARTICLES):
+        self.capacity = capacity
+        self.slots = [Particle(0, 0, 0, 0, WHITE, 0, 0) for _ in range(capacity)]
+        self.head = 0  # slot of the oldest live particle
+        self.live_count = 0
+        self.evicted = 0
+
+    def __len__(self):
+        return self.live_count
+
+    def __iter__(self):
+        # Live particles, oldest first
+        for i in range(self.live_count):
+            yield self.slots[(self.head + i) % self.capacity]
+
+    def add(self, x, y, vx, vy, color, lifetime, size):
+        if self.live_count == self.capacity:
+            # Full: overwrite the oldest particle
+            particle = self.slots[self.head]
+            self.head = (self.head + 1) % self.capacity
+            self.evicted += 1
+        else:
+            particle = self.slots[(self.head + self.live_count) % self.capacity]
+            self.live_count += 1
+        particle.x = x
+        particle.y = y
+        particle.vx = vx
+        particle.vy = vy
+        particle.color = color
+        particle.lifetime = lifetime
+        particle.size = size
+
+    def clear(self):
+        self.head = 0
+        self.live_count = 0
 
     def create_explosion(self, x, y, color, count=20):
         for _ in range(count):
             angle = random.random() * math.pi * 2
             speed = random.uniform(2, 8)
-            self.particles.append(Particle(
+            self.add(
                 x=x, y=y,
                 vx=math.cos(angle) * speed,
                 vy=math.sin(angle) * speed,
                 color=color,
                 lifetime=random.randint(20, 40),
                 size=random.randint(2, 5)
-            ))
+            )
 
     def create_jump_effect(self, x, y):
         for _ in range(10):
             angle = random.random() * math.pi * 2
             speed = random.uniform(1, 3)
-            self.particles.append(Particle(
+            self.add(
                 x=x, y=y,
                 vx=math.cos(angle) * speed,
                 vy=random.uniform(-2, 0),
                 color=CYAN,
                 lifetime=random.randint(15, 25),
                 size=random.randint(1, 3)
-            ))
+            )
 
     def create_damage_effect(self, x, y):
         for _ in range(15):
             angle = random.random() * math.pi * 2
             speed = random.uniform(1, 5)
-            self.particles.append(Particle(
+            self.add(
                 x=x, y=y,
                 vx=math.cos(angle) * speed,
                 vy=math.sin(angle) * speed,
                 color=RED,
                 lifetime=random.randint(20, 35),
                 size=random.randint(2, 4)
-            ))
+            )
 
     def update(self):
-        for particle in self.particles[:]:
+        # Single compacting pass: survivors slide towards the head in order and
+        # dead particles are swapped behind them, so removal is O(1) each
+        slots = self.slots
+        capacity = self.capacity
+        head = self.head
+        write = head
+        survivors = 0
+        for i in range(self.live_count):
+            read = (head + i) % capacity
+            particle = slots[read]
             particle.x += particle.vx
             particle.y += particle.vy
             particle.vy += 0.3  # Gravity
             particle.lifetime -= 1
 
-            if particle.lifetime <= 0:
-                self.particles.remove(particle)
+            if particle.lifetime > 0:
+                if read != write:
+                    slots[write], slots[read] = particle, slots[write]
+                write = (write + 1) % capacity
+                survivors += 1
+        self.live_count = survivors
 
     def draw(self, screen):
-        for particle in self.particles:
+        for particle in self:
             alpha = particle.lifetime / 40
             size = int(particle.size * alpha)
             if size > 0:
                 pygame.draw.circle(screen, particle.color,
                                  (int(particle.x), int(particle.y)), size)
 
+class CodeBackground:
+    # Code-like background pattern kept on a persistent surface; each tick re-rolls
+    # a bounded number of cells instead of redrawing the whole grid every frame
+    def __init__(self, font, flicker_rate=CODE_FLICKER_RATE):
+        self.glyphs = {symbol: font.render(symbol, True, (20, 20, 20)) for symbol in CODE_SYMBOLS}
+        self.flicker_rate = flicker_rate
+        self.rng = random.Random()  # keeps the flicker off the gameplay RNG
+        self.cells = [(x, y) for y in range(0, SCREEN_HEIGHT, CODE_CELL_SIZE[1])
+                      for x in range(0, SCREEN_WIDTH, CODE_CELL_SIZE[0])]
+        self.pending = 0.0
+        self.surface = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+        self.surface.fill(BLACK)
+        for cell in self.cells:
+            self.reroll(cell)
+
+    def reroll(self, cell):
+        self.surface.fill(BLACK, (cell, CODE_CELL_SIZE))
+        if self.rng.random() < CODE_DENSITY:
+            self.surface.blit(self.glyphs[self.rng.choice(CODE_SYMBOLS)], cell)
+
+    def update(self):
+        # Fractional rates carry over, so e.g. 30 cells/s changes one cell every other tick
+        self.pending += self.flicker_rate / TICK_RATE
+        changes = min(int(self.pending), len(self.cells))
+        self.pending -= int(self.pending)
+        for _ in range(changes):
+            self.reroll(self.rng.choice(self.cells))
+        return changes
+
+class HudText:
+    # One line of HUD text that re-renders only when the value it shows changes
+    def __init__(self, font, template, color):
+        self.font = font
+        self.template = template
+        self.color = color
+        self.value = None
+        self.surface = None
+        self.renders = 0
+
+    def get(self, *value):
+        if value != self.value or self.surface is None:
+            self.value = value
+            self.surface = self.font.render(self.template.format(*value), True, self.color)
+            self.renders += 1
+        return self.surface
+
 class UIRenderer:
     def __init__(self, screen):
         self.screen = screen
@@ -909,45 +1163,51 @@ class UIRenderer:
         self.ui_surface = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
         self.ui_surface.set_alpha(180)
 
+        # HUD widgets
+        self.health_text = HudText(self.font_medium, CN.HUD_HEALTH, WHITE)
+        self.score_text = HudText(self.font_medium, CN.HUD_SCORE, WHITE)
+        self.level_text = HudText(self.font_medium, CN.HUD_LEVEL, WHITE)
+        self.inv_text = HudText(self.font_small, CN.HUD_DEBUG_MODE, CYAN)
+        self.boost_text = HudText(self.font_small, CN.HUD_SPEED_BOOST, YELLOW)
+        self.jump_text = HudText(self.font_small, CN.HUD_TRIPLE_JUMP, SYNTAX_BLUE)
+
+        # Controls help never changes, so it is composited into one surface up front
+        lines = [self.font_small.render(control, True, LIGHT_GRAY) for control in CN.CONTROLS]
+        self.controls_surface = pygame.Surface((max(line.get_width() for line in lines),
+                                                (len(lines) - 1) * 25 + lines[-1].get_height()),
+                                               pygame.SRCALPHA)
+        for i, line in enumerate(lines):
+            self.controls_surface.blit(line, (0, i * 25))
+
+    def hud_renders(self):
+        return sum(widget.renders for widget in (self.health_text, self.score_text, self.level_text,
+                                                 self.inv_text, self.boost_text, self.jump_text))
+
     def draw_hud(self, player, level, time):
         # Health display
-        health_text = self.font_medium.render(CN.HUD_HEALTH.format(player.health, player.max_health),
-                                           True, WHITE)
-        self.screen.blit(health_text, (20, 20))
+        self.screen.blit(self.health_text.get(player.health, player.max_health), (20, 20))
 
         # Score display
-        score_text = self.font_medium.render(CN.HUD_SCORE.format(player.score), True, WHITE)
-        self.screen.blit(score_text, (20, 60))
+        self.screen.blit(self.score_text.get(player.score), (20, 60))
 
         # Level display
-        level_text = self.font_medium.render(CN.HUD_LEVEL.format(level), True, WHITE)
-        self.screen.blit(level_text, (20, 100))
+        self.screen.blit(self.level_text.get(level), (20, 100))
 
         # Power-up indicators
         y_offset = 140
         if player.invulnerable_timer > 0:
-            inv_text = self.font_small.render(CN.HUD_DEBUG_MODE.format(player.invulnerable_timer//60),
-                                             True, CYAN)
-            self.screen.blit(inv_text, (20, y_offset))
+            self.screen.blit(self.inv_text.get(player.invulnerable_timer//60), (20, y_offset))
             y_offset += 25
 
         if player.speed_boost_timer > 0:
-            boost_text = self.font_small.render(CN.HUD_SPEED_BOOST.format(player.speed_boost_timer//60),
-                                               True, YELLOW)
-            self.screen.blit(boost_text, (20, y_offset))
+            self.screen.blit(self.boost_text.get(player.speed_boost_timer//60), (20, y_offset))
             y_offset += 25
 
         if player.extra_jumps_timer > 0:
-            jump_text = self.font_small.render(CN.HUD_TRIPLE_JUMP.format(player.extra_jumps_timer//60),
-                                              True, SYNTAX_BLUE)
-            self.screen.blit(jump_text, (20, y_offset))
+            self.screen.blit(self.jump_text.get(player.extra_jumps_timer//60), (20, y_offset))
 
         # Controls help
-        controls = CN.CONTROLS
-
-        for i, control in enumerate(controls):
-            control_text = self.font_small.render(control, True, LIGHT_GRAY)
-            self.screen.blit(control_text, (SCREEN_WIDTH - 180, 20 + i * 25))
+        self.screen.blit(self.controls_surface, (SCREEN_WIDTH - 180, 20))
 
     def draw_menu(self):
         self.ui_surface.fill(BLACK)
@@ -1021,10 +1281,32 @@ class UIRenderer:
         continue_rect = continue_text.get_rect(center=(SCREEN_WIDTH//2, 400))
         self.screen.blit(continue_text, continue_rect)
 
+# Sound synthesis
+def synthesize(waveform, start_freq, end_freq, duration, volume, attack, release, sample_rate):
+    # Mono float32 buffer in [-1, 1]: a frequency sweep shaped by a linear attack/release envelope
+    samples = int(sample_rate * duration)
+    t = np.arange(samples, dtype=np.float64) / sample_rate
+    freq = np.linspace(start_freq, end_freq, samples)
+    phase = 2 * np.pi * np.cumsum(freq) / sample_rate
+
+    if waveform == "square":
+        wave = np.sign(np.sin(phase))
+    elif waveform == "noise":
+        # Noise with a falling tone underneath reads as a hit
+        rng = np.random.default_rng(samples)
+        wave = 0.6 * rng.uniform(-1, 1, samples) + 0.4 * np.sign(np.sin(phase))
+    else:
+        wave = np.sin(phase)
+
+    envelope = np.minimum(1.0, np.minimum(t / max(attack, 1e-6), (duration - t) / max(release, 1e-6)))
+    return (wave * np.clip(envelope, 0.0, 1.0) * volume).astype(np.float32)
+
 class SoundManager:
-    def __init__(self):
+    def __init__(self, cache_dir=SOUND_CACHE_DIR):
         self.enabled = True
         self.sounds = {}
+        self.cache_dir = cache_dir
+        self.synthesized = 0  # buffers built this run rather than loaded from the cache
         self.load_sounds()
 
     def load_sounds(self):
@@ -1033,30 +1315,56 @@ class SoundManager:
             self.create_jump_sound()
             self.create_damage_sound()
             self.create_pickup_sound()
-        except:
+        except Exception:
             self.enabled = False
 
+    def cached_buffer(self, params):
+        # Buffers are keyed by their synthesis parameters, so editing SOUND_EFFECTS
+        # simply misses the cache
+        key = hashlib.sha1(repr(params).encode("utf-8")).hexdigest()[:16]
+        path = os.path.join(self.cache_dir, f"{key}.npy")
+        try:
+            return np.load(path)
+        except (OSError, ValueError, EOFError):
+            pass  # missing or damaged: synthesize and overwrite it
+
+        buffer = synthesize(*params)
+        self.synthesized += 1
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            # Write under a temporary name and rename, so a crash can't leave a partial file
+            temp_path = f"{path}.{os.getpid()}.tmp"
+            with open(temp_path, "wb") as f:
+                np.save(f, buffer)
+            os.replace(temp_path, path)
+        except OSError:
+            pass  # a read-only checkout just synthesizes again next time
+        return buffer
+
+    def create_sound(self, name):
+        sample_rate, size, channels = pygame.mixer.get_init()
+        buffer = self.cached_buffer(SOUND_EFFECTS[name] + (sample_rate,))
+
+        # Convert to the mixer's sample format and channel count
+        if abs(size) == 8:
+            samples = buffer * 127 if size < 0 else buffer * 127 + 128
+            samples = samples.astype(np.int8 if size < 0 else np.uint8)
+        elif abs(size) == 16:
+            samples = (buffer * 32767).astype(np.int16)
+        else:
+            samples = buffer
+        if channels > 1:
+            samples = np.repeat(samples[:, None], channels, axis=1)
+        self.sounds[name] = pygame.sndarray.make_sound(np.ascontiguousarray(samples))
+
     def create_jump_sound(self):
-        # Create a simple jump sound
-        sample_rate = 22050
-        duration = 0.1
-        frequency = 400
-
-        # Generate square wave
-        samples = int(sample_rate * duration)
-        waves = []
-        for i in range(samples):
-            t = i / sample_rate
-            value = 127 if math.sin(2 * math.pi * frequency * t) > 0 else -127
-            waves.append([value, value])
+        self.create_sound("jump")
 
     def create_damage_sound(self):
-        # Create damage sound
-        pass
+        self.create_sound("damage")
 
     def create_pickup_sound(self):
-        # Create pickup sound
-        pass
+        self.create_sound("pickup")
 
     def play_sound(self, sound_name):
         if self.enabled and sound_name in self.sounds:
@@ -1072,7 +1380,9 @@ class SoundManager:
         self.play_sound("pickup")
 
 class Game:
-    def __init__(self):
+    def __init__(self, speed=1.0, max_fps=MAX_RENDER_FPS, flicker_rate=CODE_FLICKER_RATE):
+        self.speed = speed  # simulated seconds per real second; above 1 fast-forwards
+        self.max_fps = max_fps  # render cap, 0 for uncapped
         self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
         pygame.display.set_caption(CN.WINDOW_TITLE)
         self.clock = pygame.time.Clock()
@@ -1088,12 +1398,16 @@ class Game:
 
         self.level_generator = LevelGenerator()
         self.ui_renderer = UIRenderer(self.screen)
+        self.background = CodeBackground(self.ui_renderer.font_small, flicker_rate)
         self.particle_system = ParticleSystem()
         self.sound_manager = SoundManager()
 
         self.current_level = 1
         self.game_time = 0
 
+        self.profiler = FrameProfiler()
+        self.show_perf = False
+
     def start_new_game(self):
         self.current_level = 1
         self.start_level()
@@ -1102,6 +1416,7 @@ class Game:
         self.player = Player(100, 300)
         self.platforms, self.enemies, self.items, self.traps = \
             self.level_generator.generate_level(self.current_level)
+        sprite_cache.prepare(self.enemies, self.items)
         self.projectiles = []
         self.state = GameState.PLAYING
 
@@ -1144,15 +1459,21 @@ class Game:
                 elif event.key == pygame.K_r and self.state == GameState.PLAYING:
                     self.start_new_game()
 
+                elif event.key == pygame.K_F3:
+                    self.show_perf = not self.show_perf
+
                 elif event.key == pygame.K_h and self.state == GameState.MENU:
                     # Show help (for now, just continue to game)
                     self.start_new_game()
 
     def update(self):
+        # Positions at the start of this tick are what draw() interpolates from
+        self.store_positions()
         if self.state != GameState.PLAYING:
             return
 
         self.game_time += 1
+        self.background.update()
 
         # Handle input
         keys = pygame.key.get_pressed()
@@ -1175,6 +1496,7 @@ class Game:
                     RED, 50
                 )
                 return
+        self.profiler.lap("player")
 
         # Update platforms
         for platform in self.platforms:
@@ -1186,6 +1508,7 @@ class Game:
                     platform.y + platform.height//2,
                     platform.color, 15
                 )
+        self.profiler.lap("platforms")
 
         # Update enemies
         for enemy in self.enemies[:]:
@@ -1205,6 +1528,7 @@ class Game:
                     enemy.y + enemy.height//2,
                     enemy.color, 30
                 )
+        self.profiler.lap("enemies")
 
         # Update items
         for item in self.items[:]:
@@ -1216,10 +1540,12 @@ class Game:
                     item.color, 20
                 )
                 self.sound_manager.play_pickup()
+        self.profiler.lap("items")
 
         # Update traps
         for trap in self.traps:
             trap.update()
+        self.profiler.lap("traps")
 
         # Update projectiles
         for projectile in self.projectiles[:]:
@@ -1230,9 +1556,11 @@ class Game:
                 self.particle_system.create_damage_effect(
                     projectile.x, projectile.y
                 )
+        self.profiler.lap("projectiles")
 
         # Update particles
         self.particle_system.update()
+        self.profiler.lap("particles")
 
         # Check level completion
         if len(self.enemies) == 0 and len(self.items) == 0:
@@ -1242,7 +1570,36 @@ class Game:
         if self.player and self.player.health <= 0:
             self.state = GameState.GAME_OVER
 
-    def draw(self):
+    def moving_entities(self):
+        entities = self.enemies + self.projectiles + [p for p in self.platforms if p.type == "moving"]
+        if self.player:
+            entities.append(self.player)
+        return entities
+
+    def store_positions(self):
+        for entity in self.moving_entities():
+            entity.prev_x = entity.x
+            entity.prev_y = entity.y
+
+    def interpolate_positions(self, alpha):
+        # Move entities part of the way from their previous tick position; returns the real ones
+        saved = []
+        for entity in self.moving_entities():
+            saved.append((entity, entity.x, entity.y))
+            entity.x = entity.prev_x + (entity.x - entity.prev_x) * alpha
+            entity.y = entity.prev_y + (entity.y - entity.prev_y) * alpha
+            if isinstance(entity, Platform):
+                entity.rect.x = entity.x
+        return saved
+
+    def restore_positions(self, saved):
+        for entity, x, y in saved:
+            entity.x = x
+            entity.y = y
+            if isinstance(entity, Platform):
+                entity.rect.x = x
+
+    def draw(self, alpha=1.0):
         # Clear screen
         self.screen.fill(BLACK)
 
@@ -1261,42 +1618,50 @@ class Game:
         else:
             # Draw game world
             # Draw background pattern (code-like)
-            for y in range(0, SCREEN_HEIGHT, 40):
-                for x in range(0, SCREEN_WIDTH, 30):
-                    if random.random() < 0.1:
-                        char = random.choice(["{", "}", "(", ")", ";", "//"])
-                        text = self.ui_renderer.font_small.render(char, True, (20, 20, 20))
-                        self.screen.blit(text, (x, y))
+            self.screen.blit(self.background.surface, (0, 0))
+            self.profiler.lap("draw_background")
+
+            # Draw moving things between the last two ticks
+            saved_positions = self.interpolate_positions(alpha)
 
             # Draw platforms
             for platform in self.platforms:
                 platform.draw(self.screen)
+            self.profiler.lap("draw_platforms")
 
             # Draw traps
             for trap in self.traps:
                 trap.draw(self.screen)
+            self.profiler.lap("draw_traps")
 
             # Draw items
             for item in self.items:
                 item.draw(self.screen, self.game_time)
+            self.profiler.lap("draw_items")
 
             # Draw enemies
             for enemy in self.enemies:
                 enemy.draw(self.screen)
+            self.profiler.lap("draw_enemies")
 
             # Draw projectiles
             for projectile in self.projectiles:
                 projectile.draw(self.screen)
+            self.profiler.lap("draw_projectiles")
 
             # Draw player
             if self.player:
                 self.player.draw(self.screen)
+            self.restore_positions(saved_positions)
+            self.profiler.lap("draw_player")
 
             # Draw particles
             self.particle_system.draw(self.screen)
+            self.profiler.lap("draw_particles")
 
             # Draw HUD
             self.ui_renderer.draw_hud(self.player, self.current_level, self.game_time)
+            self.profiler.lap("draw_hud")
 
             # Draw pause overlay
             if self.state == GameState.PAUSED:
@@ -1311,30 +1676,80 @@ class Game:
                 continue_rect = continue_text.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT//2 + 60))
                 self.screen.blit(continue_text, continue_rect)
 
+        # Draw performance overlay
+        if self.show_perf:
+            self.profiler.draw_overlay(self.screen, (SCREEN_WIDTH - 260, 130))
+
         # Update display
         pygame.display.flip()
+        self.profiler.lap("flip")
+
+    def entity_counts(self):
+        return {
+            "platforms": len(self.platforms),
+            "enemies": len(self.enemies),
+            "items": len(self.items),
+            "traps": len(self.traps),
+            "projectiles": len(self.projectiles),
+            "particles": self.particle_system.live_count,
+        }
 
     def run(self):
+        # Fixed-timestep loop: the simulation ticks at TICK_RATE no matter how fast we render
+        accumulator = 0.0
+        last_time = time.perf_counter()
         while self.running:
+            self.profiler.begin_frame()
             self.handle_events()
-            self.update()
-            self.draw()
-            self.clock.tick(FPS)
-
+            self.profiler.lap("events")
+
+            now = time.perf_counter()
+            accumulator += (now - last_time) * self.speed
+            last_time = now
+
+            # Run every tick that is due, but never more than the catch-up cap per frame
+            max_ticks = MAX_CATCH_UP_TICKS * max(1, int(self.speed))
+            ticks = 0
+            while accumulator >= TICK_SECONDS and ticks < max_ticks:
+                self.update()
+                accumulator -= TICK_SECONDS
+                ticks += 1
+            if ticks == max_ticks:
+                accumulator = min(accumulator, TICK_SECONDS)  # too far behind: slow down instead of spiralling
+
+            self.draw(min(accumulator / TICK_SECONDS, 1.0))
+            self.profiler.end_frame(self.entity_counts())
+            self.clock.tick(self.max_fps)
+
+        self.profiler.close_log()
         pygame.quit()
         sys.exit()
 
 def main():
     """Main function to run the Hello World Adventure game"""
+    parser = argparse.ArgumentParser(description=CN.WINDOW_TITLE)
+    parser.add_argument("--perf-log", metavar="PATH",
+                        help="append per-frame phase timings to PATH as JSON lines")
+    parser.add_argument("--speed", type=float, default=1.0,
+                        help="simulation speed multiplier; e.g. 4 runs four ticks per 1/60 s")
+    parser.add_argument("--max-fps", type=int, default=MAX_RENDER_FPS,
+                        help="render frame cap (0 = uncapped); the simulation stays at 60 ticks/s")
+    parser.add_argument("--flicker", type=float, default=CODE_FLICKER_RATE,
+                        help="background code cells changed per second (0 = static)")
+    args = parser.parse_args()
+
     print(CN.START_MESSAGE)
     print(CN.LOADING_ASSETS)
 
-    game = Game()
+    game = Game(speed=args.speed, max_fps=args.max_fps, flicker_rate=args.flicker)
+    if args.perf_log:
+        game.profiler.open_log(args.perf_log)
     print(CN.GAME_LOADED)
     print("Controls:")
     for control in CN.CONTROLS:
         print(f"  {control}")
     print(f"  Q - {CN.MENU_QUIT} (from menu)")
+    print("  F3 - Performance overlay")
     print(f"\n{CN.GOOD_LUCK}")
 
     game.run()
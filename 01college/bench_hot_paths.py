@@ -0,0 +1,369 @@
+#!/usr/bin/env python3
+"""
+Hot-path benchmarks for the two pygame games in this folder.
+
+Runs on SDL's dummy video/audio drivers, so it works on CI machines
+without a display. Results are written as JSON and can be compared
+against a baseline saved earlier on the same machine:
+
+    python bench_hot_paths.py --save-baseline baseline.json
+    python bench_hot_paths.py --compare baseline.json --threshold 0.25
+
+A benchmark whose median time grows by more than the threshold counts
+as a regression and the script exits with status 1.
+"""
+
+import os
+import sys
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, "hello_world2"))
+sys.path.insert(0, os.path.join(HERE, "3"))
+
+import argparse
+import json
+import math
+import platform
+import random
+import statistics
+import time
+
+import numpy as np
+import pygame
+
+import hello_world_adventure as adventure
+import hello_world_roguelike as roguelike
+
+DEFAULT_LEVELS = (1, 10, 30)
+ENEMY_LEVELS = (50, 100)  # enemy AI cost has to stay flat well past level 50
+ENEMY_CROWDS = (8, 32, 128, 512)  # enemy counts for comparing the per-enemy and vectorised AI paths
+DEFAULT_THRESHOLD = 0.25  # 25% slower than the baseline is a regression
+
+
+# Benchmark runner
+def measure(run, iterations, rounds, setup=None):
+    # Median and best time of one iteration, in milliseconds. A run that returns
+    # False could not keep going (e.g. the game ended), and its round is dropped
+    timings = []
+    failed = 0
+    for _ in range(rounds):
+        state = setup() if setup else None
+        start = time.perf_counter()
+        for _ in range(iterations):
+            if run(state) is False:
+                failed += 1
+                break
+        else:
+            timings.append((time.perf_counter() - start) * 1000 / iterations)
+    return {
+        "median_ms": statistics.median(timings) if timings else None,
+        "min_ms": min(timings) if timings else None,
+        "iterations": iterations,
+        "rounds": rounds,
+        "failed_rounds": failed,
+    }
+
+
+# Roguelike (01college/hello_world2)
+def roguelike_game(level):
+    random.seed(level)
+    game = roguelike.Game(roguelike.ScriptedInput.run_and_jump())
+    game.current_level = level
+    game.load_level()
+    return game
+
+
+def roguelike_frame_game(level):
+    # Stands still and can't be hurt, so every timed tick stays on this level
+    random.seed(level)
+    game = roguelike.Game(roguelike.ScriptedInput([roguelike.InputState()]))
+    game.current_level = level
+    game.load_level()
+    game.player.invincible = 10 ** 9
+    return game
+
+
+def roguelike_benchmarks(levels):
+    screen = pygame.display.set_mode((roguelike.SCREEN_WIDTH, roguelike.SCREEN_HEIGHT))
+    cases = {}
+
+    for level in levels:
+        # Building a level only streams in the chunks around the start...
+        cases[f"roguelike.level_start[{level}]"] = (
+            lambda generator: generator.generate_level(),
+            lambda level=level: roguelike.LevelGenerator(level, seed=level), 20)
+
+        # ...while playing it through generates every chunk across its width
+        def generate_chunks(generator):
+            for index in range(generator.chunk_count()):
+                generator.generate_chunk(index)
+        cases[f"roguelike.generate_chunks[{level}]"] = (
+            generate_chunks, lambda level=level: roguelike.LevelGenerator(level, seed=level), 5)
+
+    def collision_setup():
+        game = roguelike_game(max(levels))
+        movers = [game.player] + list(game.level.enemies)
+        for mover in movers:
+            mover.vx = roguelike.PLAYER_SPEED
+            mover.vy = 12
+        return game.level, game.player, movers, [(m.x, m.y, m.vx, m.vy) for m in movers]
+
+    def collide(state):
+        # One tick of swept movement (with the overlap fallback) from the same starting positions
+        level, player, movers, start = state
+        for mover, (x, y, vx, vy) in zip(movers, start):
+            mover.x, mover.y, mover.vx, mover.vy = x, y, vx, vy
+        player.move(level.platform_grid, True)
+        player.move(level.platform_grid, False)
+        for enemy in movers[1:]:
+            enemy.move(level.platform_grid, enemy.vx, 0)
+            enemy.move(level.platform_grid, 0, enemy.vy)
+    cases["roguelike.collisions"] = (collide, collision_setup, 200)
+
+    def update_enemies(state):
+        manager, level, player, projectiles = state
+        manager.update(level.enemies, player, level.platform_grid, level.enemy_grid, projectiles)
+
+    for level in dict.fromkeys(levels + list(ENEMY_LEVELS)):
+        def enemy_setup(level=level):
+            game = roguelike_frame_game(level)
+            return game.enemy_manager, game.level, game.player, game.projectiles
+        cases[f"roguelike.enemies[{level}]"] = (update_enemies, enemy_setup, 200)
+
+    for count in ENEMY_CROWDS:
+        for path, threshold in (("each", count + 1), ("batch", 0)):
+            def crowd_setup(count=count, threshold=threshold):
+                # More enemies than any level loads, spread around the player, all awake
+                game = roguelike_frame_game(max(levels))
+                rng = random.Random(count)
+                level = game.level
+                level.enemies = [roguelike.Enemy(game.player.x + rng.uniform(-600, 600), rng.uniform(100, 500),
+                                                 rng.choice(list(roguelike.EnemyType)), rng)
+                                 for _ in range(count)]
+                for enemy in level.enemies:
+                    level.enemy_grid.insert(enemy)
+                return roguelike.EnemyManager(threshold), level, game.player, game.projectiles
+            cases[f"roguelike.enemies.{path}[{count}]"] = (update_enemies, crowd_setup, 200)
+
+    def projectile_setup():
+        # Shots scattered around the loaded platforms, flying in every direction
+        level = roguelike_game(max(levels)).level
+        rng = random.Random(1)
+        shots = []
+        for _ in range(200):
+            platform = rng.choice(level.platforms)
+            angle = rng.uniform(0, math.tau)
+            shots.append((platform.x + rng.uniform(0, platform.width), platform.y + rng.uniform(-60, 60),
+                          math.cos(angle) * roguelike.PROJECTILE_SPEED, math.sin(angle) * roguelike.PROJECTILE_SPEED))
+        return level.platform_grid, [np.array(column) for column in zip(*shots)]
+
+    def update_projectiles(state):
+        grid, (x, y, vx, vy) = state
+        pool = roguelike.ProjectilePool()
+        pool.spawn_many(x, y, vx, vy)
+        for _ in range(10):
+            pool.update(grid)
+    cases["roguelike.projectiles.update"] = (update_projectiles, projectile_setup, 20)
+
+    def particle_setup():
+        particles = roguelike.ParticleSystem()
+        for i in range(40):
+            particles.create_explosion(100 + i * 20, 300, roguelike.YELLOW, 50)
+        return particles
+    cases["roguelike.particles.update"] = (lambda particles: particles.update(), particle_setup, 20)
+    cases["roguelike.particles.draw"] = (lambda particles: particles.draw(screen, 0, 0), particle_setup, 20)
+
+    def item_setup():
+        rng = random.Random(1)
+        return [roguelike.Item(rng.randint(0, 1000), rng.randint(0, 700), item_type, rng)
+                for item_type in roguelike.ItemType for _ in range(10)]
+
+    def draw_items(items):
+        for item in items:
+            item.draw(screen, 0, 0)
+    cases["roguelike.item.draw"] = (draw_items, item_setup, 50)
+
+    cases["roguelike.draw_ui"] = (lambda game: game.draw_ui(), lambda: roguelike_game(1), 100)
+
+    for level in levels:
+        def frame(game, level=level):
+            game.update()
+            game.draw()
+            return not game.game_over and game.current_level == level
+        cases[f"roguelike.frame[{level}]"] = (frame, lambda level=level: roguelike_frame_game(level), 60)
+
+    return cases
+
+
+# Adventure (01college/3)
+def adventure_game(level):
+    random.seed(level)
+    game = adventure.Game()
+    game.current_level = level
+    game.start_level()
+    return game
+
+
+def adventure_frame_game(level):
+    # No keys are held on the dummy driver, so the player stands still; keep them unhurt too
+    game = adventure_game(level)
+    game.player.invulnerable_timer = 10 ** 9
+    return game
+
+
+def adventure_benchmarks(levels):
+    cases = {}
+
+    for level in levels:
+        cases[f"adventure.generate_level[{level}]"] = (
+            lambda generator, level=level: generator.generate_level(level),
+            adventure.LevelGenerator, 20)
+
+    def collision_setup():
+        game = adventure_game(max(levels))
+        return game.player, game.platforms, game.traps, game.enemies
+
+    def collide(state):
+        player, platforms, traps, enemies = state
+        player.update(platforms, traps)
+        for enemy in enemies:
+            enemy.update(player, platforms)
+    cases["adventure.collisions"] = (collide, collision_setup, 200)
+
+    def particle_setup():
+        particles = adventure.ParticleSystem(capacity=2000)
+        for i in range(40):
+            particles.create_explosion(100 + i * 20, 300, adventure.YELLOW, 50)
+        return particles
+    cases["adventure.particles.update"] = (lambda particles: particles.update(), particle_setup, 20)
+
+    def particle_draw_setup():
+        return particle_setup(), pygame.display.get_surface()
+    cases["adventure.particles.draw"] = (lambda state: state[0].draw(state[1]), particle_draw_setup, 20)
+
+    def item_setup():
+        random.seed(1)
+        items = [adventure.Item(random.randint(0, 900), random.randint(0, 700), item_type)
+                 for item_type in adventure.ItemType for _ in range(10)]
+        return items, pygame.display.get_surface()
+
+    def draw_items(state):
+        items, screen = state
+        for item in items:
+            item.draw(screen, 0)
+    cases["adventure.item.draw"] = (draw_items, item_setup, 50)
+
+    def hud_setup():
+        game = adventure_game(1)
+        return game.ui_renderer, game.player
+
+    def draw_hud(state):
+        ui_renderer, player = state
+        ui_renderer.draw_hud(player, 1, 0)
+    cases["adventure.ui.draw_hud"] = (draw_hud, hud_setup, 100)
+
+    for level in levels:
+        def frame(game):
+            game.update()
+            game.draw()
+            return game.state == adventure.GameState.PLAYING
+        cases[f"adventure.frame[{level}]"] = (frame, lambda level=level: adventure_frame_game(level), 60)
+
+    return cases
+
+
+# Baseline comparison
+def compare(results, baseline, threshold):
+    regressions = []
+    for name, result in results.items():
+        before = baseline.get("results", {}).get(name)
+        if result["median_ms"] is None:
+            print(f"  {name:<36} FAILED (every round ended early)")
+            regressions.append(name)
+            continue
+        if before is None or before.get("median_ms") is None:
+            print(f"  {name:<36} (new)")
+            continue
+        ratio = result["median_ms"] / before["median_ms"] if before["median_ms"] > 0 else 1.0
+        flag = "REGRESSION" if ratio > 1 + threshold else ""
+        print(f"  {name:<36} {before['median_ms']:9.3f} -> {result['median_ms']:9.3f} ms  "
+              f"({ratio:5.2f}x) {flag}")
+        if flag:
+            regressions.append(name)
+    return regressions
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the hot paths of both games")
+    parser.add_argument("--output", metavar="PATH", help="write the results to PATH as JSON")
+    parser.add_argument("--save-baseline", metavar="PATH", help="write the results as a new baseline")
+    parser.add_argument("--compare", metavar="PATH", help="compare against a saved baseline")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="allowed slowdown before a benchmark counts as a regression (0.25 = 25%%)")
+    parser.add_argument("--levels", default=",".join(map(str, DEFAULT_LEVELS)),
+                        help="comma-separated level numbers for generation and frame benchmarks")
+    parser.add_argument("--rounds", type=int, default=5, help="timed rounds per benchmark")
+    parser.add_argument("--filter", default="", help="only run benchmarks whose name contains this text")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    levels = [int(level) for level in args.levels.split(",")]
+
+    pygame.init()
+    cases = {}
+    cases.update(roguelike_benchmarks(levels))
+    cases.update(adventure_benchmarks(levels))
+
+    results = {}
+    for name, (run, setup, iterations) in cases.items():
+        if args.filter not in name:
+            continue
+        random.seed(0)
+        results[name] = measure(run, iterations, args.rounds, setup)
+        result = results[name]
+        if result["median_ms"] is None:
+            print(f"  {name:<36}    failed")
+        else:
+            failed = f"  ({result['failed_rounds']} rounds failed)" if result["failed_rounds"] else ""
+            print(f"  {name:<36} {result['median_ms']:9.3f} ms{failed}")
+
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "pygame": pygame.version.ver,
+            "numpy": np.__version__,
+            "machine": platform.machine(),
+            "system": platform.system(),
+            "levels": levels,
+            "rounds": args.rounds,
+        },
+        "results": results,
+    }
+    for path in (args.output, args.save_baseline):
+        if path:
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(report, f, indent=2)
+
+    status = 0
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        print(f"\nCompared with {args.compare} (threshold {args.threshold:.0%}):")
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s): {', '.join(regressions)}")
+            status = 1
+        else:
+            print("\nNo regressions")
+
+    pygame.quit()
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,9 +1,28 @@
+import os
+import sys
+
+# Headless runs have no window or audio device, so pick SDL's dummy drivers before init.
+# This runs before argparse, so parse_args disables abbreviations to keep the two in step
+def cli_flag_given(flag):
+    return any(arg == flag or arg.startswith(flag + "=") for arg in sys.argv[1:])
+
+if cli_flag_given("--headless") or (cli_flag_given("--replay") and not cli_flag_given("--realtime")):
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
 import pygame
 import random
-import sys
 import math
+import time
+import json
+import argparse
+import threading
+from bisect import bisect_left
+from collections import OrderedDict, deque
 from enum import Enum
 
+import numpy as np
+
 # Initialize Pygame
 pygame.init()
 pygame.mixer.init()
@@ -12,6 +31,10 @@ pygame.mixer.init()
 SCREEN_WIDTH = 1024
 SCREEN_HEIGHT = 768
 FPS = 60
+TICK_RATE = FPS  # every per-frame constant below is really per tick
+TICK_SECONDS = 1 / TICK_RATE
+MAX_CATCH_UP_TICKS = 5  # ticks per rendered frame before the game slows down instead
+MAX_RENDER_FPS = 144
 
 # Colors
 BLACK = (0, 0, 0)
@@ -27,6 +50,7 @@ GRAY = (128, 128, 128)
 DARK_GRAY = (64, 64, 64)
 BRIGHT_GREEN = (100, 255, 100)
 DARK_RED = (150, 0, 0)
+SPRITE_COLORKEY = (255, 0, 254)  # transparent colour in baked sprites
 
 # Game Constants
 GRAVITY = 0.8
@@ -36,62 +60,539 @@ ENEMY_SPEED = 2
 PROJECTILE_SPEED = 5
 MAX_HEALTH = 3
 INVULNERABLE_TIME = 120  # frames
-
-# Particle System
-class Particle:
-    def __init__(self, x, y, color, velocity, lifetime=30, size=3):
-        self.x = x
-        self.y = y
-        self.color = color
-        self.vx, self.vy = velocity
-        self.lifetime = lifetime
-        self.max_lifetime = lifetime
-        self.size = size
-
-    def update(self):
-        self.x += self.vx
-        self.y += self.vy
-        self.vy += 0.3  # gravity effect
-        self.lifetime -= 1
-        return self.lifetime > 0
-
-    def draw(self, screen, camera_x, camera_y):
-        if self.lifetime > 0:
-            alpha = self.lifetime / self.max_lifetime
-            size = int(self.size * alpha)
-            if size > 0:
-                pygame.draw.circle(screen, self.color,
-                                 (int(self.x - camera_x), int(self.y - camera_y)), size)
-
-# Particle System Manager
+GRID_CELL_SIZE = 128  # spatial hash cell size in pixels
+MIN_PLATFORM_THICKNESS = 15  # steps shorter than this can't pass through a platform, so they skip the sweep
+MAX_PARTICLES = 4096  # preallocated particle slots
+MAX_PROJECTILES = 512  # preallocated projectile slots
+PROJECTILE_BATCH_SWEEP = 16  # from this many live shots, platform sweeps run vectorised instead of one by one
+PROJECTILE_LIFETIME = 180  # 3 seconds
+ITEM_BOB_MARGIN = 3  # items bob this far above and below their rect
+ERROR_ATTACK_RANGE = 300  # ERROR enemies shoot inside this distance
+ENEMY_ACTIVE_RADIUS = SCREEN_WIDTH  # enemies this close to the player update every tick
+ENEMY_MID_RADIUS = SCREEN_WIDTH * 2  # out to here they update every ENEMY_MID_INTERVAL ticks; beyond, they sleep
+ENEMY_MID_INTERVAL = 4
+ENEMY_HALF_SIZE = 35 // 2  # shots leave from the enemy centre
+ENEMY_BATCH_AI = 256  # from this many loaded enemies, AI runs as one NumPy pass instead of enemy by enemy
+AI_STATES = ("patrol", "chase", "attack")
+PARALLAX_BACKGROUND = True  # scroll a distant star layer with the camera
+CHUNK_WIDTH = SCREEN_WIDTH  # width of a streamed level section
+CHUNKS_AHEAD = 1  # sections kept loaded past the right edge of the screen
+CHUNKS_BEHIND = 1  # sections kept loaded behind the left edge before eviction
+ENDLESS_CHUNKS_PER_LEVEL = 3  # endless mode difficulty step
+REPLAY_VERSION = 1
+PREFETCH_AT = 0.5  # start generating the next level past this fraction of the current one
+TEXT_CACHE_SIZE = 256  # rendered text surfaces kept by the LRU cache
+DIRTY_RECT_LIMIT = 64  # more changed rects than this and a full flip is cheaper
+PERF_WINDOW = 300  # frames kept per phase for rolling percentiles
+PERF_OVERLAY_REFRESH = 30  # frames between perf overlay redraws
+
+# Spatial Hash (uniform grid broadphase for collisions)
+class SpatialHash:
+    def __init__(self, cell_size=GRID_CELL_SIZE):
+        self.cell_size = cell_size
+        self.cells = {}
+        self.entries = {}
+
+    def cell_range(self, rect):
+        size = self.cell_size
+        return (rect.left // size, rect.top // size,
+                (rect.right - 1) // size, (rect.bottom - 1) // size)
+
+    def insert(self, obj):
+        bounds = self.cell_range(obj.get_rect())
+        self.entries[obj] = bounds
+        x0, y0, x1, y1 = bounds
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                self.cells.setdefault((cx, cy), []).append(obj)
+
+    def remove(self, obj):
+        bounds = self.entries.pop(obj, None)
+        if bounds is None:
+            return
+        x0, y0, x1, y1 = bounds
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                bucket = self.cells[(cx, cy)]
+                bucket.remove(obj)
+                if not bucket:
+                    del self.cells[(cx, cy)]
+
+    def update(self, obj):
+        # Only re-bucket objects that actually crossed a cell boundary
+        if self.entries.get(obj) != self.cell_range(obj.get_rect()):
+            self.remove(obj)
+            self.insert(obj)
+
+    def query(self, rect):
+        x0, y0, x1, y1 = self.cell_range(rect)
+        found = []
+        seen = set()
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                bucket = self.cells.get((cx, cy))
+                if not bucket:
+                    continue
+                for obj in bucket:
+                    if obj not in seen:
+                        seen.add(obj)
+                        found.append(obj)
+        return found
+
+    def sweep(self, x, y, width, height, dx, dy):
+        # Earliest object hit by a box moving (dx, dy) this tick: (time, normal, obj) or None
+        left = math.floor(min(x, x + dx))
+        top = math.floor(min(y, y + dy))
+        area = pygame.Rect(left, top, math.ceil(width + abs(dx)) + 2, math.ceil(height + abs(dy)) + 2)
+        best = None
+        for obj in self.query(area):
+            hit = sweep_aabb(x, y, width, height, dx, dy, obj.x, obj.y, obj.width, obj.height)
+            if hit is not None and (best is None or hit[0] < best[0]):
+                best = (hit[0], hit[1], obj)
+        return best
+
+    def __len__(self):
+        return len(self.entries)
+
+# Swept AABB (time of impact and contact normal of a moving box against a static one)
+def sweep_axis(start, size, delta, other_start, other_size):
+    # Entry and exit times along one axis; touching edges don't count as overlap
+    if delta > 0:
+        return (other_start - (start + size)) / delta, (other_start + other_size - start) / delta
+    if delta < 0:
+        return (other_start + other_size - start) / delta, (other_start - (start + size)) / delta
+    if start + size <= other_start or start >= other_start + other_size:
+        return math.inf, -math.inf  # never overlaps on this axis
+    return -math.inf, math.inf
+
+def sweep_aabb(x, y, width, height, dx, dy, bx, by, b_width, b_height):
+    x_entry, x_exit = sweep_axis(x, width, dx, bx, b_width)
+    y_entry, y_exit = sweep_axis(y, height, dy, by, b_height)
+    entry = max(x_entry, y_entry)
+    exit_time = min(x_exit, y_exit)
+    # Boxes that already overlap (entry < 0) are left to the overlap fallback
+    if entry >= exit_time or entry < 0 or entry > 1:
+        return None
+    if x_entry > y_entry:
+        return entry, (-1 if dx > 0 else 1, 0)
+    return entry, (0, -1 if dy > 0 else 1)
+
+def sweep_axis_many(start, size, delta, other_start, other_size):
+    # sweep_axis over broadcast NumPy arrays
+    near = np.where(delta > 0, other_start - (start + size), other_start + other_size - start)
+    far = np.where(delta > 0, other_start + other_size - start, other_start - (start + size))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        entry = near / delta
+        exit_time = far / delta
+    still = delta == 0
+    overlap = (start + size > other_start) & (start < other_start + other_size)
+    entry = np.where(still, np.where(overlap, -np.inf, np.inf), entry)
+    exit_time = np.where(still, np.where(overlap, np.inf, -np.inf), exit_time)
+    return entry, exit_time
+
+def sweep_times(x, y, width, height, dx, dy, bx, by, b_width, b_height):
+    # Earliest time of impact of each moving box against any of the static boxes, inf for none.
+    # A cheap bounds test picks the pairs whose swept area touches before the slab test runs
+    near = ((np.minimum(x, x + dx)[:, None] <= bx + b_width) & (np.maximum(x, x + dx)[:, None] + width >= bx) &
+            (np.minimum(y, y + dy)[:, None] <= by + b_height) & (np.maximum(y, y + dy)[:, None] + height >= by))
+    rows, cols = np.nonzero(near)
+    times = np.full(len(x), np.inf)
+    if len(rows) == 0:
+        return times
+    x_entry, x_exit = sweep_axis_many(x[rows], width, dx[rows], bx[cols], b_width[cols])
+    y_entry, y_exit = sweep_axis_many(y[rows], height, dy[rows], by[cols], b_height[cols])
+    entry = np.maximum(x_entry, y_entry)
+    hit = (entry < np.minimum(x_exit, y_exit)) & (entry >= 0) & (entry <= 1)
+    np.minimum.at(times, rows[hit], entry[hit])
+    return times
+
+# Sorted Index (entities sorted by left edge, bisect lookups for viewport culling)
+class SortedIndex:
+    def __init__(self, entities=()):
+        self.rebuild(entities)
+
+    def rebuild(self, entities):
+        # Only meant for entities whose x never changes after spawning
+        self.entities = sorted(entities, key=lambda e: e.x)
+        self.starts = [e.x for e in self.entities]
+        self.max_width = max((e.width for e in self.entities), default=0)
+
+    def remove(self, obj):
+        i = bisect_left(self.starts, obj.x)
+        while self.entities[i] is not obj:
+            i += 1
+        del self.entities[i]
+        del self.starts[i]
+
+    def query(self, rect):
+        # Nothing starting more than max_width left of the rect can reach into it
+        lo = bisect_left(self.starts, rect.left - self.max_width)
+        hi = bisect_left(self.starts, rect.right)
+        top = rect.top
+        bottom = rect.bottom
+        left = rect.left
+        return [e for e in self.entities[lo:hi]
+                if e.x + e.width > left and e.y < bottom and e.y + e.height > top]
+
+    def __len__(self):
+        return len(self.entities)
+
+# Text Cache (fonts loaded once per size, rendered strings kept in an LRU)
+class TextCache:
+    def __init__(self, max_entries=TEXT_CACHE_SIZE):
+        self.max_entries = max_entries
+        self.fonts = {}
+        self.surfaces = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.font_loads = 0
+
+    def get_font(self, size, font_name=None):
+        font = self.fonts.get((font_name, size))
+        if font is None:
+            font = pygame.font.Font(font_name, size)
+            self.fonts[(font_name, size)] = font
+            self.font_loads += 1
+        return font
+
+    def render(self, text, size, color, font_name=None, antialias=True):
+        key = (font_name, size, text, tuple(color), antialias)
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.surfaces.move_to_end(key)
+            self.hits += 1
+            return surface
+
+        self.misses += 1
+        surface = self.get_font(size, font_name).render(text, antialias, color)
+        self.surfaces[key] = surface
+        if len(self.surfaces) > self.max_entries:
+            self.surfaces.popitem(last=False)  # evict least recently used
+        return surface
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "font_loads": self.font_loads,
+                "entries": len(self.surfaces)}
+
+text_cache = TextCache()
+
+# Frame Profiler (per-phase frame timings with rolling percentiles)
+class FrameProfiler:
+    def __init__(self, window=PERF_WINDOW):
+        self.window = window
+        self.samples = {}
+        self.current = {}
+        self.counts = {}
+        self.frame = 0
+        self.last_time = time.perf_counter()
+        self.log_file = None
+        self.overlay = None
+        self.overlay_frame = -PERF_OVERLAY_REFRESH
+
+    def open_log(self, path):
+        self.log_file = open(path, "a", encoding="utf-8")
+
+    def close_log(self):
+        if self.log_file:
+            self.log_file.close()
+            self.log_file = None
+
+    def begin_frame(self):
+        self.current = {}
+        self.last_time = time.perf_counter()
+
+    def lap(self, phase):
+        # Charge the time since the previous lap to this phase
+        now = time.perf_counter()
+        self.current[phase] = self.current.get(phase, 0.0) + (now - self.last_time) * 1000
+        self.last_time = now
+
+    def record(self, phase, ms):
+        # Timings that don't belong to a single frame, e.g. background work
+        samples = self.samples.get(phase)
+        if samples is None:
+            samples = self.samples[phase] = deque(maxlen=self.window)
+        samples.append(ms)
+
+    def end_frame(self, counts=None):
+        self.current["total"] = sum(self.current.values())
+        for phase, ms in self.current.items():
+            self.record(phase, ms)
+        self.counts = counts or {}
+
+        if self.log_file:
+            record = {"frame": self.frame, "ms": {k: round(v, 4) for k, v in self.current.items()},
+                      "counts": self.counts}
+            self.log_file.write(json.dumps(record) + "\n")
+        self.frame += 1
+
+    def percentile(self, phase, pct):
+        samples = sorted(self.samples.get(phase, ()))
+        if not samples:
+            return 0.0
+        return samples[min(len(samples) - 1, int(pct / 100 * len(samples)))]
+
+    def summary(self):
+        return {phase: (self.percentile(phase, 50), self.percentile(phase, 99)) for phase in self.samples}
+
+    def draw_overlay(self, screen, position):
+        # Percentiles are re-sorted only every few frames
+        if self.frame - self.overlay_frame >= PERF_OVERLAY_REFRESH:
+            lines = [f"{'phase':<16}{'p50':>7}{'p99':>7}"]
+            for phase, (p50, p99) in self.summary().items():
+                lines.append(f"{phase:<16}{p50:7.2f}{p99:7.2f}")
+            lines.append(" ".join(f"{name}={count}" for name, count in self.counts.items()))
+
+            font = text_cache.get_font(18)
+            rendered = [font.render(line, True, WHITE) for line in lines]
+            width = max(text.get_width() for text in rendered) + 10
+            self.overlay = pygame.Surface((width, len(rendered) * 16 + 8), pygame.SRCALPHA)
+            self.overlay.fill((0, 0, 0, 170))
+            for i, text in enumerate(rendered):
+                self.overlay.blit(text, (5, 4 + i * 16))
+            self.overlay_frame = self.frame
+        return screen.blit(self.overlay, position)
+
+# Input State (player controls for one tick)
+class InputState:
+    __slots__ = ("left", "right", "jump")
+
+    def __init__(self, left=False, right=False, jump=False):
+        self.left = left
+        self.right = right
+        self.jump = jump
+
+    def to_bits(self):
+        return self.left | self.right << 1 | self.jump << 2
+
+    @classmethod
+    def from_bits(cls, bits):
+        return cls(bool(bits & 1), bool(bits & 2), bool(bits & 4))
+
+# Input Source (controls plus the seed of every new run)
+class InputSource:
+    finished = False
+    replaying = False
+
+    def next_seed(self):
+        return random.randrange(2 ** 32)
+
+    def close(self, game):
+        pass
+
+# Keyboard Input (live controls)
+class KeyboardInput(InputSource):
+    def poll(self, events):
+        keys = pygame.key.get_pressed()
+        jump = any(event.type == pygame.KEYDOWN and event.key == pygame.K_SPACE for event in events)
+        return InputState(bool(keys[pygame.K_LEFT]), bool(keys[pygame.K_RIGHT]), jump)
+
+# Scripted Input (replaces the keyboard in headless runs)
+class ScriptedInput(InputSource):
+    def __init__(self, states, loop=True):
+        self.states = list(states)
+        self.loop = loop
+        self.tick = 0
+
+    @classmethod
+    def run_and_jump(cls, jump_every=45):
+        # Hold right and jump at a fixed interval
+        states = [InputState(right=True, jump=(i == 0)) for i in range(jump_every)]
+        return cls(states)
+
+    def poll(self, events):
+        if self.tick >= len(self.states):
+            if not self.loop or not self.states:
+                return InputState()
+            self.tick = 0
+        state = self.states[self.tick]
+        self.tick += 1
+        return state
+
+    @property
+    def finished(self):
+        return not self.loop and self.tick >= len(self.states)
+
+# Input Recorder (wraps another source and logs run seeds and per-tick controls)
+class InputRecorder(InputSource):
+    def __init__(self, source, path):
+        self.source = source
+        self.path = path
+        self.seeds = []
+        self.ticks = []
+
+    @property
+    def finished(self):
+        return self.source.finished
+
+    def next_seed(self):
+        seed = self.source.next_seed()
+        self.seeds.append(seed)
+        return seed
+
+    def poll(self, events):
+        state = self.source.poll(events)
+        self.ticks.append(state.to_bits())
+        return state
+
+    def encode_ticks(self):
+        # Run-length encode the tick bits: [[bits, count], ...]
+        runs = []
+        for bits in self.ticks:
+            if runs and runs[-1][0] == bits:
+                runs[-1][1] += 1
+            else:
+                runs.append([bits, 1])
+        return runs
+
+    def close(self, game):
+        log = {
+            "version": REPLAY_VERSION,
+            "endless": game.endless,
+            "seeds": self.seeds,
+            "ticks": self.encode_ticks(),
+            "final": game.replay_state(),
+        }
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump(log, f, separators=(",", ":"))
+
+# Replay Input (plays a recorded log back tick for tick)
+class ReplayInput(InputSource):
+    replaying = True
+
+    def __init__(self, log):
+        if log.get("version") != REPLAY_VERSION:
+            raise ValueError(f"unsupported replay version {log.get('version')}")
+        self.endless = log["endless"]
+        self.seeds = list(log["seeds"])
+        self.states = [InputState.from_bits(bits) for bits, count in log["ticks"] for _ in range(count)]
+        self.final = log.get("final")
+        self.seed_index = 0
+        self.tick = 0
+
+    @classmethod
+    def load(cls, path):
+        with open(path, encoding="utf-8") as f:
+            return cls(json.load(f))
+
+    @property
+    def finished(self):
+        return self.tick >= len(self.states)
+
+    def next_seed(self):
+        if self.seed_index >= len(self.seeds):
+            raise ValueError("replay log has no seed left for another run")
+        seed = self.seeds[self.seed_index]
+        self.seed_index += 1
+        return seed
+
+    def poll(self, events):
+        if self.finished:
+            return InputState()
+        state = self.states[self.tick]
+        self.tick += 1
+        return state
+
+# Particle System Manager (structure-of-arrays backend)
 class ParticleSystem:
-    def __init__(self):
-        self.particles = []
+    def __init__(self, capacity=MAX_PARTICLES):
+        self.capacity = capacity
+        self.x = np.zeros(capacity, dtype=np.float32)
+        self.y = np.zeros(capacity, dtype=np.float32)
+        self.vx = np.zeros(capacity, dtype=np.float32)
+        self.vy = np.zeros(capacity, dtype=np.float32)
+        self.lifetime = np.zeros(capacity, dtype=np.int32)
+        self.max_lifetime = np.ones(capacity, dtype=np.int32)
+        self.size = np.zeros(capacity, dtype=np.float32)
+        self.color = np.zeros((capacity, 3), dtype=np.uint8)
+        self.alive = np.zeros(capacity, dtype=bool)
+        # Free slots are popped from the end, so low indices are reused first
+        self.free_slots = list(range(capacity - 1, -1, -1))
+        self.high_water = 0  # every live particle has an index below this
+        self.live_count = 0
+        self.rng = np.random.default_rng()
+
+    def spawn(self, x, y, color, vx, vy, lifetime, size):
+        count = min(len(vx), len(self.free_slots))
+        if count <= 0:
+            return  # Pool exhausted, drop the extra particles
+        slots = np.array(self.free_slots[-count:], dtype=np.intp)
+        del self.free_slots[-count:]
+
+        self.x[slots] = x
+        self.y[slots] = y
+        self.vx[slots] = vx[:count]
+        self.vy[slots] = vy[:count]
+        self.lifetime[slots] = lifetime
+        self.max_lifetime[slots] = lifetime
+        self.size[slots] = size
+        self.color[slots] = color
+        self.alive[slots] = True
+        self.live_count += count
+        self.high_water = max(self.high_water, int(slots.max()) + 1)
 
     def create_explosion(self, x, y, color, count=20):
-        for _ in range(count):
-            angle = random.uniform(0, 2 * math.pi)
-            speed = random.uniform(2, 8)
-            velocity = (math.cos(angle) * speed, math.sin(angle) * speed)
-            self.particles.append(Particle(x, y, color, velocity))
+        angle = self.rng.uniform(0, 2 * math.pi, count)
+        speed = self.rng.uniform(2, 8, count)
+        self.spawn(x, y, color, np.cos(angle) * speed, np.sin(angle) * speed, 30, 3)
 
     def create_trail(self, x, y, color, count=3):
-        for _ in range(count):
-            velocity = (random.uniform(-2, 2), random.uniform(-2, 0))
-            self.particles.append(Particle(x, y, color, velocity, 20, 2))
+        self.spawn(x, y, color, self.rng.uniform(-2, 2, count), self.rng.uniform(-2, 0, count), 20, 2)
 
     def update(self):
-        self.particles = [p for p in self.particles if p.update()]
+        if self.live_count == 0:
+            self.high_water = 0
+            return
+
+        n = self.high_water
+        self.x[:n] += self.vx[:n]
+        self.y[:n] += self.vy[:n]
+        self.vy[:n] += 0.3  # gravity effect
+        self.lifetime[:n] -= 1
+
+        # Recycle slots of particles that just expired
+        expired = np.flatnonzero(self.alive[:n] & (self.lifetime[:n] <= 0))
+        if len(expired):
+            self.alive[expired] = False
+            self.free_slots.extend(expired.tolist())
+            self.live_count -= len(expired)
 
     def draw(self, screen, camera_x, camera_y):
-        for particle in self.particles:
-            particle.draw(screen, camera_x, camera_y)
+        if self.live_count == 0:
+            return
+
+        live = np.flatnonzero(self.alive[:self.high_water])
+        alpha = self.lifetime[live] / self.max_lifetime[live]
+        sizes = (self.size[live] * alpha).astype(np.int32)
+        screen_x = (self.x[live] - camera_x).astype(np.int32)
+        screen_y = (self.y[live] - camera_y).astype(np.int32)
+
+        visible = ((sizes > 0) & (screen_x > -sizes) & (screen_x < SCREEN_WIDTH + sizes) &
+                   (screen_y > -sizes) & (screen_y < SCREEN_HEIGHT + sizes))
+        if not visible.any():
+            return None
+        for px, py, size, color in zip(screen_x[visible].tolist(), screen_y[visible].tolist(),
+                                       sizes[visible].tolist(), self.color[live[visible]].tolist()):
+            pygame.draw.circle(screen, color, (px, py), size)
+
+        # Screen area touched by this draw, for dirty-rect updates
+        sizes = sizes[visible]
+        left = int((screen_x[visible] - sizes).min())
+        top = int((screen_y[visible] - sizes).min())
+        right = int((screen_x[visible] + sizes).max()) + 1
+        bottom = int((screen_y[visible] + sizes).max()) + 1
+        return pygame.Rect(left, top, right - left, bottom - top)
+
+    def __len__(self):
+        return self.live_count
 
 # Player Class
 class Player:
     def __init__(self, x, y):
         self.x = x
         self.y = y
+        self.prev_x = x  # position at the previous tick, for interpolated drawing
+        self.prev_y = y
         self.width = 30
         self.height = 40
         self.vx = 0
@@ -102,55 +603,58 @@ class Player:
         self.speed_boost = 0
         self.double_jump_available = True
         self.facing_right = True
+        self.standing_on = None  # platform we landed on this tick
+
+    def update(self, platform_grid, enemy_grid, projectiles, controls):
+        self.prev_x = self.x
+        self.prev_y = self.y
 
-    def update(self, platforms, enemies, projectiles, events):
         # Handle input
-        keys = pygame.key.get_pressed()
         self.vx = 0
 
-        if keys[pygame.K_LEFT]:
+        if controls.left:
             self.vx = -PLAYER_SPEED
             self.facing_right = False
-        if keys[pygame.K_RIGHT]:
+        if controls.right:
             self.vx = PLAYER_SPEED
             self.facing_right = True
 
-        # Check for space key press event
-        for event in events:
-            if event.type == pygame.KEYDOWN and event.key == pygame.K_SPACE:
-                if self.on_ground:
-                    # First jump from ground
-                    self.vy = JUMP_STRENGTH
-                    self.on_ground = False
-                elif self.double_jump_available:
-                    # Double jump in air
-                    self.vy = JUMP_STRENGTH * 0.8
-                    self.double_jump_available = False
+        # Check for space key press
+        if controls.jump:
+            if self.on_ground:
+                # First jump from ground
+                self.vy = JUMP_STRENGTH
+                self.on_ground = False
+            elif self.double_jump_available:
+                # Double jump in air
+                self.vy = JUMP_STRENGTH * 0.8
+                self.double_jump_available = False
 
         # Apply gravity
         self.vy += GRAVITY
         self.vy = min(self.vy, 20)  # Terminal velocity
 
         # Move horizontally
-        self.x += self.vx
-        self.check_collisions(platforms, True)
+        self.move(platform_grid, True)
 
         # Move vertically
-        self.y += self.vy
         self.on_ground = False
-        self.check_collisions(platforms, False)
+        self.standing_on = None
+        self.move(platform_grid, False)
 
-        # Check enemy collisions
+        # Check enemy collisions (only against entities in nearby cells)
         if self.invincible <= 0:
-            for enemy in enemies:
-                if self.get_rect().colliderect(enemy.get_rect()):
+            player_rect = self.get_rect()
+            for enemy in enemy_grid.query(player_rect):
+                if player_rect.colliderect(enemy.get_rect()):
                     self.take_damage()
                     return False  # Player died
 
-            for projectile in projectiles:
-                if self.get_rect().colliderect(projectile.get_rect()):
-                    self.take_damage()
-                    return False  # Player died
+            hits = projectiles.collide_rect(player_rect)
+            if len(hits):
+                projectiles.release(hits)
+                self.take_damage()
+                return False  # Player died
 
         # Update invincibility and power-ups
         if self.invincible > 0:
@@ -160,26 +664,44 @@ class Player:
 
         return True  # Player alive
 
-    def check_collisions(self, platforms, horizontal):
+    def move(self, platform_grid, horizontal):
+        # Sweep along one axis so fast falls can't tunnel through thin platforms
+        dx, dy = (self.vx, 0) if horizontal else (0, self.vy)
+        hit = None
+        if abs(dx) >= MIN_PLATFORM_THICKNESS or abs(dy) >= MIN_PLATFORM_THICKNESS:
+            hit = platform_grid.sweep(self.x, self.y, self.width, self.height, dx, dy)
+        if hit is None:
+            self.x += dx
+            self.y += dy
+        else:
+            self.stop_against(hit[2], horizontal)
+        self.check_collisions(platform_grid, horizontal)
+
+    def check_collisions(self, platform_grid, horizontal):
+        # Push out of anything we already overlap, e.g. after spawning inside a platform
         player_rect = self.get_rect()
 
-        for platform in platforms:
+        for platform in platform_grid.query(player_rect):
             if player_rect.colliderect(platform.get_rect()):
-                if horizontal:
-                    if self.vx > 0:  # Moving right
-                        self.x = platform.x - self.width
-                    elif self.vx < 0:  # Moving left
-                        self.x = platform.x + platform.width
-                else:
-                    if self.vy > 0:  # Falling and landing
-                        self.y = platform.y - self.height
-                        self.vy = 0
-                        if not self.on_ground:  # Just landed
-                            self.on_ground = True
-                            self.double_jump_available = True  # Reset double jump
-                    elif self.vy < 0:  # Jumping and hitting ceiling
-                        self.y = platform.y + platform.height
-                        self.vy = 0
+                self.stop_against(platform, horizontal)
+
+    def stop_against(self, platform, horizontal):
+        if horizontal:
+            if self.vx > 0:  # Moving right
+                self.x = platform.x - self.width
+            elif self.vx < 0:  # Moving left
+                self.x = platform.x + platform.width
+        else:
+            if self.vy > 0:  # Falling and landing
+                self.y = platform.y - self.height
+                self.vy = 0
+                self.standing_on = platform
+                if not self.on_ground:  # Just landed
+                    self.on_ground = True
+                    self.double_jump_available = True  # Reset double jump
+            elif self.vy < 0:  # Jumping and hitting ceiling
+                self.y = platform.y + platform.height
+                self.vy = 0
 
     def get_rect(self):
         return pygame.Rect(self.x, self.y, self.width, self.height)
@@ -191,18 +713,33 @@ class Player:
     def heal(self):
         self.health = min(self.health + 1, MAX_HEALTH)
 
+    def sprite_entry(self, atlas, camera_x, camera_y, alpha=1.0):
+        flash = self.invincible % 10 < 5
+        x = self.prev_x + (self.x - self.prev_x) * alpha
+        y = self.prev_y + (self.y - self.prev_y) * alpha
+        return atlas.entry(("player", self.facing_right, flash), x - camera_x, y - camera_y)
+
+    def snap(self):
+        # Forget the previous tick's position, e.g. after a teleport
+        self.prev_x = self.x
+        self.prev_y = self.y
+
     def draw(self, screen, camera_x, camera_y):
-        color = BRIGHT_GREEN if self.invincible % 10 < 5 else GREEN
-        pygame.draw.rect(screen, color,
-                        (self.x - camera_x, self.y - camera_y, self.width, self.height))
+        screen.blit(*self.sprite_entry(SpriteAtlas.get(), camera_x, camera_y))
+
+    @staticmethod
+    def bake_sprite(facing_right, flash):
+        sprite = SpriteAtlas.new_sprite(30, 40)
+        color = BRIGHT_GREEN if flash else GREEN
+        pygame.draw.rect(sprite, color, (0, 0, 30, 40))
         # Draw eyes
-        eye_y = self.y - camera_y + 10
-        if self.facing_right:
-            pygame.draw.circle(screen, WHITE, (self.x - camera_x + 20, eye_y), 3)
-            pygame.draw.circle(screen, BLACK, (self.x - camera_x + 22, eye_y), 2)
+        if facing_right:
+            pygame.draw.circle(sprite, WHITE, (20, 10), 3)
+            pygame.draw.circle(sprite, BLACK, (22, 10), 2)
         else:
-            pygame.draw.circle(screen, WHITE, (self.x - camera_x + 10, eye_y), 3)
-            pygame.draw.circle(screen, BLACK, (self.x - camera_x + 8, eye_y), 2)
+            pygame.draw.circle(sprite, WHITE, (10, 10), 3)
+            pygame.draw.circle(sprite, BLACK, (8, 10), 2)
+        return sprite
 
 # Enemy Types
 class EnemyType(Enum):
@@ -211,9 +748,11 @@ class EnemyType(Enum):
 
 # Enemy Class
 class Enemy:
-    def __init__(self, x, y, enemy_type):
+    def __init__(self, x, y, enemy_type, rng=random):
         self.x = x
         self.y = y
+        self.prev_x = x
+        self.prev_y = y
         self.width = 35
         self.height = 35
         self.enemy_type = enemy_type
@@ -221,151 +760,419 @@ class Enemy:
         self.vy = 0
         self.health = 1
         self.shoot_cooldown = 0
-        self.patrol_direction = random.choice([-1, 1])
+        self.patrol_direction = rng.choice([-1, 1])
         self.patrol_range = 150
         self.start_x = x
         self.ai_state = "patrol"  # patrol, chase, attack
         self.detection_range = 200
+        self.sleeping = False
 
-    def update(self, player, platforms):
-        # AI behavior based on type
-        if self.enemy_type == EnemyType.BUG:
-            self.update_bug_ai(player, platforms)
-        elif self.enemy_type == EnemyType.ERROR:
-            self.update_error_ai(player, platforms)
+    def apply_physics(self, platform_grid, steps=1):
+        self.prev_x = self.x
+        self.prev_y = self.y
 
         # Apply gravity
         self.vy += GRAVITY
         self.vy = min(self.vy, 20)
 
-        # Move
-        self.x += self.vx
-        self.check_collisions(platforms, True)
-
-        self.y += self.vy
-        self.check_collisions(platforms, False)
-
-        # Update shoot cooldown
-        if self.shoot_cooldown > 0:
-            self.shoot_cooldown -= 1
-
-    def update_bug_ai(self, player, platforms):
-        # Calculate distance to player
-        dx = player.x - self.x
-        dy = player.y - self.y
-        distance = math.sqrt(dx**2 + dy**2)
-
-        if distance < self.detection_range:
-            # Chase player
-            self.ai_state = "chase"
-            if dx > 0:
-                self.vx = ENEMY_SPEED * 1.5
-            else:
-                self.vx = -ENEMY_SPEED * 1.5
-        else:
-            # Patrol
-            self.ai_state = "patrol"
-            if abs(self.x - self.start_x) > self.patrol_range:
-                self.patrol_direction *= -1
-            self.vx = ENEMY_SPEED * self.patrol_direction
-
-    def update_error_ai(self, player, platforms):
-        # Calculate distance to player
-        dx = player.x - self.x
-        dy = player.y - self.y
-        distance = math.sqrt(dx**2 + dy**2)
-
-        if distance < 300:  # Attack range
-            self.ai_state = "attack"
-            # Shoot at player
-            if self.shoot_cooldown <= 0:
-                return self.create_projectile(player)
+        # Move (far-off enemies take one coarse step that walks several ticks' worth)
+        self.move(platform_grid, self.vx * steps, 0)
+        self.move(platform_grid, 0, self.vy)
+
+    def move(self, platform_grid, dx, dy):
+        hit = None
+        if abs(dx) >= MIN_PLATFORM_THICKNESS or abs(dy) >= MIN_PLATFORM_THICKNESS:
+            hit = platform_grid.sweep(self.x, self.y, self.width, self.height, dx, dy)
+        if hit is None:
+            self.x += dx
+            self.y += dy
         else:
-            self.ai_state = "patrol"
-            # Slow patrol
-            if abs(self.x - self.start_x) > 100:
-                self.patrol_direction *= -1
-            self.vx = ENEMY_SPEED * 0.5 * self.patrol_direction
+            self.stop_against(hit[2], dy == 0)
+        self.check_collisions(platform_grid, dy == 0)
 
-        return None
-
-    def check_collisions(self, platforms, horizontal):
+    def check_collisions(self, platform_grid, horizontal):
         enemy_rect = self.get_rect()
 
-        for platform in platforms:
+        for platform in platform_grid.query(enemy_rect):
             if enemy_rect.colliderect(platform.get_rect()):
-                if horizontal:
-                    if self.vx > 0:
-                        self.x = platform.x - self.width
-                    elif self.vx < 0:
-                        self.x = platform.x + platform.width
-                else:
-                    if self.vy > 0:
-                        self.y = platform.y - self.height
-                        self.vy = 0
-                    elif self.vy < 0:
-                        self.y = platform.y + platform.height
-                        self.vy = 0
-
-    def create_projectile(self, player):
-        # Calculate angle to player
-        dx = player.x - self.x
-        dy = player.y - self.y
-        distance = math.sqrt(dx**2 + dy**2)
-
-        if distance > 0:
-            vx = (dx / distance) * PROJECTILE_SPEED
-            vy = (dy / distance) * PROJECTILE_SPEED
-            self.shoot_cooldown = 60  # 1 second at 60 FPS
-            return Projectile(self.x + self.width // 2, self.y + self.height // 2, vx, vy)
-        return None
+                self.stop_against(platform, horizontal)
+
+    def stop_against(self, platform, horizontal):
+        if horizontal:
+            if self.vx > 0:
+                self.x = platform.x - self.width
+            elif self.vx < 0:
+                self.x = platform.x + platform.width
+        else:
+            if self.vy > 0:
+                self.y = platform.y - self.height
+                self.vy = 0
+            elif self.vy < 0:
+                self.y = platform.y + platform.height
+                self.vy = 0
 
     def get_rect(self):
         return pygame.Rect(self.x, self.y, self.width, self.height)
 
+    def sprite_entry(self, atlas, camera_x, camera_y, alpha=1.0):
+        x = self.prev_x + (self.x - self.prev_x) * alpha
+        y = self.prev_y + (self.y - self.prev_y) * alpha
+        return atlas.entry(("enemy", self.enemy_type), x - camera_x, y - camera_y)
+
     def draw(self, screen, camera_x, camera_y):
+        screen.blit(*self.sprite_entry(SpriteAtlas.get(), camera_x, camera_y))
+
+    @staticmethod
+    def bake_sprite(enemy_type):
+        sprite = SpriteAtlas.new_sprite(35, 35)
+        center = 35 // 2
         # Draw enemy based on type
-        if self.enemy_type == EnemyType.BUG:
-            color = ORANGE
+        if enemy_type == EnemyType.BUG:
             # Draw bug-like enemy
-            pygame.draw.rect(screen, color,
-                           (self.x - camera_x, self.y - camera_y, self.width, self.height))
-            pygame.draw.circle(screen, RED,
-                             (self.x - camera_x + self.width // 2, self.y - camera_y + self.height // 2), 8)
+            pygame.draw.rect(sprite, ORANGE, (0, 0, 35, 35))
+            pygame.draw.circle(sprite, RED, (center, center), 8)
         else:  # ERROR
-            color = DARK_RED
             # Draw error-like enemy
-            pygame.draw.rect(screen, color,
-                           (self.x - camera_x, self.y - camera_y, self.width, self.height))
+            pygame.draw.rect(sprite, DARK_RED, (0, 0, 35, 35))
             # Draw "X" for error
-            center_x = self.x - camera_x + self.width // 2
-            center_y = self.y - camera_y + self.height // 2
-            pygame.draw.line(screen, WHITE, (center_x - 8, center_y - 8), (center_x + 8, center_y + 8), 3)
-            pygame.draw.line(screen, WHITE, (center_x + 8, center_y - 8), (center_x - 8, center_y + 8), 3)
-
-# Projectile Class
-class Projectile:
-    def __init__(self, x, y, vx, vy):
-        self.x = x
-        self.y = y
-        self.vx = vx
-        self.vy = vy
-        self.width = 8
-        self.height = 8
-        self.lifetime = 180  # 3 seconds
+            pygame.draw.line(sprite, WHITE, (center - 8, center - 8), (center + 8, center + 8), 3)
+            pygame.draw.line(sprite, WHITE, (center + 8, center - 8), (center - 8, center + 8), 3)
+        return sprite
 
-    def update(self):
-        self.x += self.vx
-        self.y += self.vy
-        self.lifetime -= 1
-        return self.lifetime > 0
+# Enemy Manager (AI state in arrays, one vectorised decision pass per tick)
+class EnemyManager:
+    def __init__(self, batch_threshold=ENEMY_BATCH_AI):
+        self.enemies = []
+        self.batch_threshold = batch_threshold
+        self.batch = False  # below the threshold the enemy objects hold the AI state themselves
+        self.tick = 0
+        self.tier_counts = (0, 0, 0)  # active, mid-range, sleeping
+        self.resize(0)
+
+    def resize(self, count):
+        self.x = np.zeros(count)
+        self.y = np.zeros(count)
+        self.vx = np.zeros(count)
+        self.start_x = np.zeros(count)
+        self.patrol_direction = np.zeros(count)
+        self.patrol_range = np.zeros(count)
+        self.detection_range = np.zeros(count)
+        self.shoot_cooldown = np.zeros(count, dtype=np.int32)
+        self.is_bug = np.zeros(count, dtype=bool)
+        self.ai_state = np.zeros(count, dtype=np.int8)
+        self.sleeping = np.zeros(count, dtype=bool)
+        self.slot = np.arange(count)  # staggers mid-range updates across ticks
+
+    def sync(self, enemies):
+        # Hand AI state back to the old enemy objects, then load the new set
+        self.write_back()
+        self.enemies = enemies
+        self.batch = len(enemies) >= self.batch_threshold
+        self.resize(len(enemies) if self.batch else 0)
+        if not self.batch:
+            return
+        for i, enemy in enumerate(enemies):
+            self.x[i] = enemy.x
+            self.y[i] = enemy.y
+            self.vx[i] = enemy.vx
+            self.start_x[i] = enemy.start_x
+            self.patrol_direction[i] = enemy.patrol_direction
+            self.patrol_range[i] = enemy.patrol_range if enemy.enemy_type == EnemyType.BUG else 100
+            self.detection_range[i] = enemy.detection_range
+            self.shoot_cooldown[i] = enemy.shoot_cooldown
+            self.is_bug[i] = enemy.enemy_type == EnemyType.BUG
+            self.ai_state[i] = AI_STATES.index(enemy.ai_state)
+            self.sleeping[i] = enemy.sleeping
+
+    def write_back(self):
+        if not self.batch:
+            return
+        for i, enemy in enumerate(self.enemies):
+            enemy.vx = float(self.vx[i])
+            enemy.patrol_direction = int(self.patrol_direction[i])
+            enemy.shoot_cooldown = int(self.shoot_cooldown[i])
+            enemy.ai_state = AI_STATES[self.ai_state[i]]
+            enemy.sleeping = bool(self.sleeping[i])
+
+    def think(self, due, dx, dy, distance):
+        # Detection and attack masks, reversals and velocities for the enemies due this tick
+        chase = due & self.is_bug & (distance < self.detection_range)
+        attack = due & ~self.is_bug & (distance < ERROR_ATTACK_RANGE)
+        patrol = due & ~(chase | attack)
+
+        # Patrol reversals and velocities
+        reverse = patrol & (np.abs(self.x - self.start_x) > self.patrol_range)
+        self.patrol_direction[reverse] *= -1
+        patrol_speed = np.where(self.is_bug, ENEMY_SPEED, ENEMY_SPEED * 0.5)
+        self.vx = np.where(patrol, patrol_speed * self.patrol_direction, self.vx)
+        self.vx = np.where(chase, np.where(dx > 0, ENEMY_SPEED * 1.5, -ENEMY_SPEED * 1.5), self.vx)
+        state = np.where(chase, 1, np.where(attack, 2, 0)).astype(np.int8)
+        self.ai_state = np.where(due, state, self.ai_state)
+
+        # Aim a shot from every ERROR enemy that is in range and off cooldown
+        fire = attack & (self.shoot_cooldown <= 0) & (distance > 0)
+        self.shoot_cooldown[fire] = 60  # 1 second at 60 FPS
+        safe_distance = np.where(fire, distance, 1)
+        return (fire, dx / safe_distance * PROJECTILE_SPEED, dy / safe_distance * PROJECTILE_SPEED)
+
+    def schedule(self, distance):
+        # Per-tick step count: 1 near the player, ENEMY_MID_INTERVAL every few ticks further out, 0 asleep
+        active = distance < ENEMY_ACTIVE_RADIUS
+        mid = ~active & (distance < ENEMY_MID_RADIUS)
+        mid_turn = (self.slot + self.tick) % ENEMY_MID_INTERVAL == 0
+        steps = np.where(active, 1, np.where(mid & mid_turn, ENEMY_MID_INTERVAL, 0))
+
+        # Sleepers wake exactly where they fell asleep, in patrol and with no interpolation streak
+        waking = self.sleeping & (active | mid)
+        for i in np.flatnonzero(waking).tolist():
+            self.enemies[i].prev_x = self.enemies[i].x
+            self.enemies[i].prev_y = self.enemies[i].y
+        self.ai_state[waking] = 0
+        self.sleeping = ~(active | mid)
+        self.tier_counts = (int(active.sum()), int(mid.sum()), int(self.sleeping.sum()))
+        return steps
+
+    def update(self, enemies, player, platform_grid, enemy_grid, projectiles):
+        if enemies is not self.enemies:
+            self.sync(enemies)
+        if not enemies:
+            self.tier_counts = (0, 0, 0)
+            return
+        self.tick += 1
+        if not self.batch:
+            self.update_each(player, platform_grid, enemy_grid, projectiles)
+            return
 
-    def get_rect(self):
-        return pygame.Rect(self.x, self.y, self.width, self.height)
+        # Distances to the player decide which enemies run this tick
+        dx = player.x - self.x
+        dy = player.y - self.y
+        distance = np.hypot(dx, dy)
+        steps = self.schedule(distance)
+        due = steps > 0
+
+        fire, shot_vx, shot_vy = self.think(due, dx, dy, distance)
+        if fire.any():
+            projectiles.spawn_many(self.x[fire] + ENEMY_HALF_SIZE, self.y[fire] + ENEMY_HALF_SIZE,
+                                   shot_vx[fire], shot_vy[fire])
+
+        # Gravity and platform collision still resolve per enemy, only for the ones due
+        for i, enemy_steps in zip(np.flatnonzero(due).tolist(), steps[due].tolist()):
+            enemy = enemies[i]
+            enemy.vx = float(self.vx[i])
+            enemy.apply_physics(platform_grid, enemy_steps)
+            enemy_grid.update(enemy)
+            self.x[i] = enemy.x
+            self.y[i] = enemy.y
+
+        # Update shoot cooldown
+        self.shoot_cooldown = np.maximum(self.shoot_cooldown - steps, 0).astype(np.int32)
+
+    def update_each(self, player, platform_grid, enemy_grid, projectiles):
+        # The same schedule and decisions as schedule() and think(), one enemy at a time:
+        # a level only has a handful of enemies loaded, too few to pay NumPy's per-call overhead
+        active_count = mid_count = 0
+        for i, enemy in enumerate(self.enemies):
+            dx = player.x - enemy.x
+            dy = player.y - enemy.y
+            distance = math.hypot(dx, dy)
+            if distance < ENEMY_ACTIVE_RADIUS:
+                active_count += 1
+                steps = 1
+            elif distance < ENEMY_MID_RADIUS:
+                mid_count += 1
+                steps = ENEMY_MID_INTERVAL if (i + self.tick) % ENEMY_MID_INTERVAL == 0 else 0
+            else:
+                enemy.sleeping = True
+                continue
+            if enemy.sleeping:
+                enemy.prev_x = enemy.x
+                enemy.prev_y = enemy.y
+                enemy.ai_state = "patrol"
+                enemy.sleeping = False
+            if steps == 0:
+                continue
+
+            is_bug = enemy.enemy_type == EnemyType.BUG
+            if is_bug and distance < enemy.detection_range:
+                enemy.ai_state = "chase"
+                enemy.vx = ENEMY_SPEED * 1.5 if dx > 0 else -ENEMY_SPEED * 1.5
+            elif not is_bug and distance < ERROR_ATTACK_RANGE:
+                enemy.ai_state = "attack"
+                if enemy.shoot_cooldown <= 0 and distance > 0:
+                    enemy.shoot_cooldown = 60  # 1 second at 60 FPS
+                    projectiles.spawn(enemy.x + ENEMY_HALF_SIZE, enemy.y + ENEMY_HALF_SIZE,
+                                      dx / distance * PROJECTILE_SPEED, dy / distance * PROJECTILE_SPEED)
+            else:
+                enemy.ai_state = "patrol"
+                if abs(enemy.x - enemy.start_x) > (enemy.patrol_range if is_bug else 100):
+                    enemy.patrol_direction *= -1
+                enemy.vx = (ENEMY_SPEED if is_bug else ENEMY_SPEED * 0.5) * enemy.patrol_direction
+
+            enemy.apply_physics(platform_grid, steps)
+            enemy_grid.update(enemy)
+            enemy.shoot_cooldown = max(enemy.shoot_cooldown - steps, 0)
+        self.tier_counts = (active_count, mid_count, len(self.enemies) - active_count - mid_count)
+
+# Projectile Pool (fixed-capacity arrays, vectorised update and collision)
+class ProjectilePool:
+    width = 8
+    height = 8
+
+    def __init__(self, capacity=MAX_PROJECTILES):
+        self.capacity = capacity
+        self.x = np.zeros(capacity, dtype=np.float64)
+        self.y = np.zeros(capacity, dtype=np.float64)
+        self.prev_x = np.zeros(capacity, dtype=np.float64)
+        self.prev_y = np.zeros(capacity, dtype=np.float64)
+        self.vx = np.zeros(capacity, dtype=np.float64)
+        self.vy = np.zeros(capacity, dtype=np.float64)
+        self.lifetime = np.zeros(capacity, dtype=np.int32)
+        self.active = np.zeros(capacity, dtype=bool)
+        self.free_slots = list(range(capacity - 1, -1, -1))
+        self.high_water = 0  # every active shot has an index below this
+        self.count = 0
+
+    def spawn(self, x, y, vx, vy, lifetime=PROJECTILE_LIFETIME):
+        if not self.free_slots:
+            return False  # Pool is full, the shot is not fired
+        slot = self.free_slots.pop()
+        self.x[slot] = self.prev_x[slot] = x
+        self.y[slot] = self.prev_y[slot] = y
+        self.vx[slot] = vx
+        self.vy[slot] = vy
+        self.lifetime[slot] = lifetime
+        self.active[slot] = True
+        self.count += 1
+        self.high_water = max(self.high_water, slot + 1)
+        return True
+
+    def spawn_many(self, x, y, vx, vy, lifetime=PROJECTILE_LIFETIME):
+        count = min(len(x), len(self.free_slots))
+        if count <= 0:
+            return 0
+        slots = np.array(self.free_slots[-count:], dtype=np.intp)
+        del self.free_slots[-count:]
+        self.x[slots] = self.prev_x[slots] = x[:count]
+        self.y[slots] = self.prev_y[slots] = y[:count]
+        self.vx[slots] = vx[:count]
+        self.vy[slots] = vy[:count]
+        self.lifetime[slots] = lifetime
+        self.active[slots] = True
+        self.count += count
+        self.high_water = max(self.high_water, int(slots.max()) + 1)
+        return count
+
+    def release(self, slots):
+        self.active[slots] = False
+        self.free_slots.extend(slots.tolist())
+        self.count -= len(slots)
+
+    def update(self, platform_grid=None):
+        # Returns where shots hit a platform this tick
+        if self.count == 0:
+            self.high_water = 0
+            return []
+
+        n = self.high_water
+        impacts = []
+        if platform_grid is not None:
+            # Sweep each shot's box so fast shots stop at thin platforms instead of passing through
+            live = np.flatnonzero(self.active[:n])
+            if len(live) < PROJECTILE_BATCH_SWEEP:
+                blocked, impacts = self.sweep_each(live, platform_grid)
+            else:
+                blocked, impacts = self.sweep_batch(live, platform_grid)
+
+        self.prev_x[:n] = self.x[:n]
+        self.prev_y[:n] = self.y[:n]
+        self.x[:n] += self.vx[:n]
+        self.y[:n] += self.vy[:n]
+        self.lifetime[:n] -= 1
+        if impacts:
+            self.lifetime[blocked] = 0
+
+        expired = np.flatnonzero(self.active[:n] & (self.lifetime[:n] <= 0))
+        if len(expired):
+            self.release(expired)
+        return impacts
+
+    def sweep_each(self, live, platform_grid):
+        # A handful of shots: plain per-shot sweeps beat NumPy's per-call overhead
+        half = self.width // 2
+        blocked = []
+        impacts = []
+        for slot, x, y, vx, vy in zip(live.tolist(), self.x[live].tolist(), self.y[live].tolist(),
+                                      self.vx[live].tolist(), self.vy[live].tolist()):
+            hit = platform_grid.sweep(x - half, y - half, self.width, self.height, vx, vy)
+            if hit is not None:
+                blocked.append(slot)
+                impacts.append((x + vx * hit[0], y + vy * hit[0]))
+        return blocked, impacts
+
+    def sweep_batch(self, live, platform_grid):
+        # Many shots: one grid query for the area they all cover, then a vectorised slab test
+        blocked = []
+        impacts = []
+        x = self.x[live] - self.width // 2
+        y = self.y[live] - self.height // 2
+        vx = self.vx[live]
+        vy = self.vy[live]
+        left = math.floor(min(x.min(), (x + vx).min()))
+        top = math.floor(min(y.min(), (y + vy).min()))
+        right = math.ceil(max(x.max(), (x + vx).max())) + self.width
+        bottom = math.ceil(max(y.max(), (y + vy).max())) + self.height
+        platforms = platform_grid.query(pygame.Rect(left, top, right - left + 2, bottom - top + 2))
+        if platforms:
+            bounds = np.array([(p.x, p.y, p.width, p.height) for p in platforms], dtype=np.float64)
+            times = sweep_times(x, y, self.width, self.height, vx, vy, *bounds.T)
+            hit = np.isfinite(times)
+            if hit.any():
+                blocked = live[hit]
+                t = times[hit]
+                impacts = list(zip((self.x[blocked] + vx[hit] * t).tolist(),
+                                   (self.y[blocked] + vy[hit] * t).tolist()))
+
+        return blocked, impacts
+
+    def collide_rect(self, rect):
+        # One AABB test against every active shot, centred on (x, y) like the sweep and the sprite
+        # (positions truncate like pygame.Rect)
+        if self.count == 0:
+            return np.empty(0, dtype=np.intp)
+        n = self.high_water
+        left = (self.x[:n] - self.width // 2).astype(np.int64)
+        top = (self.y[:n] - self.height // 2).astype(np.int64)
+        hit = (self.active[:n] & (left < rect.right) & (left + self.width > rect.left) &
+               (top < rect.bottom) & (top + self.height > rect.top))
+        return np.flatnonzero(hit)
+
+    def sprite_entries(self, atlas, camera_x, camera_y, alpha=1.0):
+        if self.count == 0:
+            return []
+        n = self.high_water
+        # The shot is drawn centred on (x, y), interpolated from the previous tick
+        x = self.prev_x[:n] + (self.x[:n] - self.prev_x[:n]) * alpha
+        y = self.prev_y[:n] + (self.y[:n] - self.prev_y[:n]) * alpha
+        screen_x = (x - camera_x).astype(np.int64)
+        screen_y = (y - camera_y).astype(np.int64)
+        visible = (self.active[:n] & (screen_x > -self.width) & (screen_x < SCREEN_WIDTH) &
+                   (screen_y > -self.height) & (screen_y < SCREEN_HEIGHT + self.height))
+        surface = atlas.surface
+        area = atlas.areas[("projectile",)]
+        return [(surface, (px - 4, py - 4), area)
+                for px, py in zip(screen_x[visible].tolist(), screen_y[visible].tolist())]
 
     def draw(self, screen, camera_x, camera_y):
-        pygame.draw.circle(screen, YELLOW,
-                         (int(self.x - camera_x), int(self.y - camera_y)), 4)
+        screen.blits(self.sprite_entries(SpriteAtlas.get(), camera_x, camera_y), doreturn=False)
+
+    def __len__(self):
+        return self.count
+
+    @staticmethod
+    def bake_sprite():
+        sprite = SpriteAtlas.new_sprite(9, 9)
+        pygame.draw.circle(sprite, YELLOW, (4, 4), 4)
+        return sprite
 
 # Item Types
 class ItemType(Enum):
@@ -376,14 +1183,15 @@ class ItemType(Enum):
 
 # Item Class
 class Item:
-    def __init__(self, x, y, item_type):
+    def __init__(self, x, y, item_type, rng=random):
         self.x = x
         self.y = y
         self.width = 25
         self.height = 25
         self.item_type = item_type
-        self.bob_offset = random.uniform(0, math.pi * 2)
+        self.bob_offset = rng.uniform(0, math.pi * 2)
         self.collected = False
+        self.chunk_key = None
 
     def update(self):
         # Bob up and down
@@ -404,45 +1212,33 @@ class Item:
 
         self.collected = True
 
+    def sprite_entry(self, atlas, camera_x, camera_y):
+        # Calculate bob position
+        bob_y = math.sin(self.bob_offset) * 3
+        return atlas.entry(("item", self.item_type), self.x - camera_x, self.y - camera_y + bob_y)
+
     def draw(self, screen, camera_x, camera_y):
         if not self.collected:
-            # Calculate bob position
-            bob_y = math.sin(self.bob_offset) * 3
-
-            # Draw item based on type
-            if self.item_type == ItemType.CODE:
-                color = GREEN
-                pygame.draw.rect(screen, color,
-                               (self.x - camera_x, self.y - camera_y + bob_y, self.width, self.height))
-                # Draw "C" for code
-                font = pygame.font.Font(None, 16)
-                text = font.render("C", True, WHITE)
-                screen.blit(text, (self.x - camera_x + 8, self.y - camera_y + bob_y + 5))
-            elif self.item_type == ItemType.DEBUG:
-                color = CYAN
-                pygame.draw.circle(screen, color,
-                                 (self.x - camera_x + self.width // 2, self.y - camera_y + self.height // 2 + int(bob_y)),
-                                 self.width // 2)
-            elif self.item_type == ItemType.SPEED:
-                color = YELLOW
-                # Draw lightning bolt shape
-                points = [
-                    (self.x - camera_x + 10, self.y - camera_y + bob_y),
-                    (self.x - camera_x + 5, self.y - camera_y + 15 + bob_y),
-                    (self.x - camera_x + 15, self.y - camera_y + 15 + bob_y),
-                    (self.x - camera_x + 10, self.y - camera_y + 25 + bob_y),
-                    (self.x - camera_x + 20, self.y - camera_y + 10 + bob_y),
-                    (self.x - camera_x + 15, self.y - camera_y + 10 + bob_y),
-                    (self.x - camera_x + 20, self.y - camera_y + bob_y)
-                ]
-                pygame.draw.polygon(screen, color, points)
-            elif self.item_type == ItemType.DOUBLE_JUMP:
-                color = PURPLE
-                pygame.draw.rect(screen, color,
-                               (self.x - camera_x, self.y - camera_y + bob_y, self.width, self.height))
-                font = pygame.font.Font(None, 12)
-                text = font.render("DJ", True, WHITE)
-                screen.blit(text, (self.x - camera_x + 4, self.y - camera_y + bob_y + 8))
+            screen.blit(*self.sprite_entry(SpriteAtlas.get(), camera_x, camera_y))
+
+    @staticmethod
+    def bake_sprite(item_type):
+        sprite = SpriteAtlas.new_sprite(26, 26)
+        # Draw item based on type
+        if item_type == ItemType.CODE:
+            pygame.draw.rect(sprite, GREEN, (0, 0, 25, 25))
+            # Draw "C" for code
+            sprite.blit(text_cache.render("C", 16, WHITE), (8, 5))
+        elif item_type == ItemType.DEBUG:
+            pygame.draw.circle(sprite, CYAN, (12, 12), 12)
+        elif item_type == ItemType.SPEED:
+            # Draw lightning bolt shape
+            points = [(10, 0), (5, 15), (15, 15), (10, 25), (20, 10), (15, 10), (20, 0)]
+            pygame.draw.polygon(sprite, YELLOW, points)
+        elif item_type == ItemType.DOUBLE_JUMP:
+            pygame.draw.rect(sprite, PURPLE, (0, 0, 25, 25))
+            sprite.blit(text_cache.render("DJ", 12, WHITE), (4, 8))
+        return sprite
 
 # Platform Class
 class Platform:
@@ -460,10 +1256,7 @@ class Platform:
     def update(self, player):
         if self.platform_type == "fake":
             # Fake platform falls when stepped on
-            player_rect = player.get_rect()
-            platform_rect = self.get_rect()
-
-            if player_rect.colliderect(platform_rect) and player.vy > 0:
+            if player.standing_on is self:
                 self.triggered = True
 
             if self.triggered:
@@ -478,100 +1271,483 @@ class Platform:
     def get_rect(self):
         return pygame.Rect(self.x, self.y, self.width, self.height)
 
-    def draw(self, screen, camera_x, camera_y):
+    def is_static(self):
+        # Untriggered platforms never change and can be baked into the terrain cache
+        return not self.triggered
+
+    def get_color(self):
         if self.platform_type == "fake":
             if not self.triggered:
-                color = GRAY
-            else:
-                color = DARK_GRAY
+                return GRAY
+            return DARK_GRAY
         elif self.platform_type == "trap":
-            color = DARK_RED
-        else:
-            color = WHITE
+            return DARK_RED
+        return WHITE
 
-        pygame.draw.rect(screen, color,
-                        (self.x - camera_x, self.y - camera_y, self.width, self.height))
+    def draw(self, screen, camera_x, camera_y):
+        return pygame.draw.rect(screen, self.get_color(),
+                                (self.x - camera_x, self.y - camera_y, self.width, self.height))
+
+# Sprite Atlas (every entity visual state rasterised once, drawn with batched blits)
+class SpriteAtlas:
+    instance = None
+
+    @classmethod
+    def get(cls):
+        # Built on first use, once the display mode is set
+        if cls.instance is None:
+            cls.instance = cls()
+        return cls.instance
+
+    @staticmethod
+    def new_sprite(width, height):
+        sprite = pygame.Surface((width, height))
+        sprite.fill(SPRITE_COLORKEY)
+        return sprite
 
-# Level Generator
+    def __init__(self):
+        sprites = {}
+        for facing_right in (True, False):
+            for flash in (True, False):
+                sprites[("player", facing_right, flash)] = Player.bake_sprite(facing_right, flash)
+        for enemy_type in EnemyType:
+            sprites[("enemy", enemy_type)] = Enemy.bake_sprite(enemy_type)
+        for item_type in ItemType:
+            sprites[("item", item_type)] = Item.bake_sprite(item_type)
+        sprites[("projectile",)] = ProjectilePool.bake_sprite()
+
+        # Pack everything into one strip surface
+        width = sum(sprite.get_width() + 1 for sprite in sprites.values())
+        height = max(sprite.get_height() for sprite in sprites.values())
+        self.surface = pygame.Surface((width, height)).convert()
+        self.surface.fill(SPRITE_COLORKEY)
+        self.areas = {}
+        x = 0
+        for key, sprite in sprites.items():
+            self.surface.blit(sprite, (x, 0))
+            self.areas[key] = pygame.Rect(x, 0, sprite.get_width(), sprite.get_height())
+            x += sprite.get_width() + 1
+        self.surface.set_colorkey(SPRITE_COLORKEY, pygame.RLEACCEL)
+
+    def entry(self, key, x, y):
+        # (source, dest, area) tuple for Surface.blits
+        return (self.surface, (x, y), self.areas[key])
+
+# Level Chunk (one streamed section of a level)
+class LevelChunk:
+    def __init__(self, index):
+        self.index = index
+        self.platforms = []
+        self.enemies = []
+        self.items = []
+
+# Level Generator (streams fixed-width sections around the camera)
 class LevelGenerator:
-    def __init__(self, level_number):
+    def __init__(self, level_number, endless=False, seed=None):
         self.level_number = level_number
+        self.endless = endless
+        self.seed = seed if seed is not None else random.randrange(2 ** 32)
         self.platforms = []
         self.enemies = []
         self.items = []
-        self.level_width = 3000 + (level_number * 500)
+        self.fake_platforms = []
+        self.platform_grid = SpatialHash()
+        self.enemy_grid = SpatialHash()
+        self.item_grid = SpatialHash()
+        self.item_index = SortedIndex()
+        self.fake_index = SortedIndex()
+        self.chunks = {}
+        # State that outlives eviction, since regenerating a chunk only restores its starting layout
+        self.collected_items = set()
+        self.triggered_platforms = {}  # (chunk, platform number) -> fake platform already set off
+        self.spawned_chunks = set()  # chunks whose generated enemies have entered play
+        self.parked_enemies = {}  # chunk -> enemies that were standing in it when it was evicted
+        self.level_width = None if endless else 3000 + (level_number * 500)
         self.generate_level()
 
     def generate_level(self):
         # Clear existing
-        self.platforms.clear()
-        self.enemies.clear()
-        self.items.clear()
+        for index in list(self.chunks):
+            self.unload_chunk(index)
+        self.collected_items.clear()
+        self.triggered_platforms.clear()
+        self.spawned_chunks.clear()
+        self.parked_enemies.clear()
+        self.update_chunks(0)
+
+    def chunk_count(self):
+        if self.level_width is None:
+            return None
+        return -(-self.level_width // CHUNK_WIDTH)
+
+    def chunk_at(self, x):
+        index = max(int(x // CHUNK_WIDTH), 0)
+        if self.level_width is not None:
+            index = min(index, self.chunk_count() - 1)
+        return index
+
+    def update_chunks(self, camera_x):
+        # Keep the sections around the camera loaded and evict the rest
+        first = int(camera_x // CHUNK_WIDTH) - CHUNKS_BEHIND
+        last = int((camera_x + SCREEN_WIDTH) // CHUNK_WIDTH) + CHUNKS_AHEAD
+        first = max(first, 0)
+        if self.level_width is not None:
+            last = min(last, self.chunk_count() - 1)
+
+        changed = False
+        for index in list(self.chunks):
+            if index < first or index > last:
+                self.unload_chunk(index)
+                changed = True
+        for index in range(first, last + 1):
+            if index not in self.chunks:
+                self.load_chunk(index)
+                changed = True
+
+        if changed:
+            self.rebuild_lists()
+        return changed
+
+    def load_chunk(self, index):
+        chunk = self.generate_chunk(index)
+        for key, platform in self.triggered_platforms.items():
+            if key[0] == index:
+                chunk.platforms[key[1]] = platform
+        # Generated enemies only spawn once; after that the chunk holds whoever was left in it
+        if index in self.spawned_chunks:
+            chunk.enemies = []
+        self.spawned_chunks.add(index)
+        chunk.enemies.extend(self.parked_enemies.pop(index, []))
+        self.chunks[index] = chunk
+        for platform in chunk.platforms:
+            self.platform_grid.insert(platform)
+        for enemy in chunk.enemies:
+            self.enemy_grid.insert(enemy)
+        for item in chunk.items:
+            self.item_grid.insert(item)
+
+    def unload_chunk(self, index):
+        chunk = self.chunks.pop(index)
+        for i, platform in enumerate(chunk.platforms):
+            self.platform_grid.remove(platform)
+            if platform.triggered:
+                self.triggered_platforms[(index, i)] = platform
+        # Enemies that walked into a chunk that is still loaded move over to it, the rest wait
+        # in the chunk they are standing in until it is loaded again
+        for enemy in chunk.enemies:
+            home = self.chunk_at(enemy.x)
+            if home in self.chunks:
+                self.chunks[home].enemies.append(enemy)
+            else:
+                self.enemy_grid.remove(enemy)
+                self.parked_enemies.setdefault(home, []).append(enemy)
+        for item in chunk.items:
+            self.item_grid.remove(item)
+
+    def rebuild_lists(self):
+        self.platforms = []
+        self.enemies = []
+        self.items = []
+        for index in sorted(self.chunks):
+            chunk = self.chunks[index]
+            self.platforms.extend(chunk.platforms)
+            self.enemies.extend(chunk.enemies)
+            self.items.extend(chunk.items)
+        self.fake_platforms = [p for p in self.platforms if p.platform_type == "fake"]
+        self.item_index.rebuild(self.items)
+        self.fake_index.rebuild(self.fake_platforms)
+
+    def remove_item(self, item):
+        self.items.remove(item)
+        self.item_grid.remove(item)
+        self.item_index.remove(item)
+        self.chunks[item.chunk_key[0]].items.remove(item)
+        self.collected_items.add(item.chunk_key)  # don't respawn if the chunk is regenerated
+
+    def chunk_difficulty(self, index):
+        # Endless runs get harder every few sections
+        if self.endless:
+            return self.level_number + index // ENDLESS_CHUNKS_PER_LEVEL
+        return self.level_number
+
+    def spawn_count(self, rng, total, span, overlap):
+        # Spread a per-level total over sections in proportion to their overlap with the span
+        if overlap <= 0:
+            return 0
+        expected = total * overlap / span
+        count = int(expected)
+        if rng.random() < expected - count:
+            count += 1
+        return count
+
+    def generate_chunk(self, index):
+        # Each section has its own RNG, so regenerating it gives the same layout
+        rng = random.Random(self.seed * 1000003 + index)
+        level = self.chunk_difficulty(index)
+        chunk = LevelChunk(index)
+        start = index * CHUNK_WIDTH
+        end = start + CHUNK_WIDTH
+        nominal_width = 3000 + (level * 500)
+        width = self.level_width if self.level_width is not None else float("inf")
+
+        def span(margin):
+            lo, hi = max(start, margin), min(end, width - margin)
+            return lo, hi, nominal_width - 2 * margin, hi - lo
 
         # Generate ground platforms
         ground_y = SCREEN_HEIGHT - 100
-        for x in range(0, self.level_width, 200):
-            platform_width = random.randint(150, 250)
-            self.platforms.append(Platform(x, ground_y, platform_width, 20))
+        for x in range(-(-start // 200) * 200, int(min(end, width)), 200):
+            platform_width = rng.randint(150, 250)
+            chunk.platforms.append(Platform(x, ground_y, platform_width, 20))
 
         # Generate floating platforms
-        for i in range(15 + self.level_number * 3):
-            x = random.randint(200, self.level_width - 200)
-            y = random.randint(200, ground_y - 100)
-            width = random.randint(80, 200)
+        lo, hi, total_span, overlap = span(200)
+        for i in range(self.spawn_count(rng, 15 + level * 3, total_span, overlap)):
+            x = rng.randint(lo, hi - 1)
+            y = rng.randint(200, ground_y - 100)
+            platform_width = rng.randint(80, 200)
 
             # Add fake platforms occasionally
-            if random.random() < 0.2 + (self.level_number * 0.05):
+            if rng.random() < 0.2 + (level * 0.05):
                 platform_type = "fake"
             else:
                 platform_type = "normal"
 
-            self.platforms.append(Platform(x, y, width, 20, platform_type))
+            chunk.platforms.append(Platform(x, y, platform_width, 20, platform_type))
 
         # Generate trap platforms
-        for i in range(3 + self.level_number):
-            x = random.randint(400, self.level_width - 400)
-            y = random.randint(300, ground_y - 150)
-            self.platforms.append(Platform(x, y, 60, 15, "trap"))
+        lo, hi, total_span, overlap = span(400)
+        for i in range(self.spawn_count(rng, 3 + level, total_span, overlap)):
+            x = rng.randint(lo, hi - 1)
+            y = rng.randint(300, ground_y - 150)
+            chunk.platforms.append(Platform(x, y, 60, 15, "trap"))
 
         # Generate enemies
-        for i in range(5 + self.level_number * 2):
-            x = random.randint(300, self.level_width - 300)
-            y = random.randint(100, ground_y - 150)
-            enemy_type = random.choice([EnemyType.BUG, EnemyType.ERROR])
-            self.enemies.append(Enemy(x, y, enemy_type))
+        lo, hi, total_span, overlap = span(300)
+        for i in range(self.spawn_count(rng, 5 + level * 2, total_span, overlap)):
+            x = rng.randint(lo, hi - 1)
+            y = rng.randint(100, ground_y - 150)
+            enemy_type = rng.choice([EnemyType.BUG, EnemyType.ERROR])
+            chunk.enemies.append(Enemy(x, y, enemy_type, rng))
 
         # Generate items
-        for i in range(8 + self.level_number):
-            x = random.randint(200, self.level_width - 200)
-            y = random.randint(150, ground_y - 200)
-            item_type = random.choice(list(ItemType))
-            self.items.append(Item(x, y, item_type))
+        lo, hi, total_span, overlap = span(200)
+        for i in range(self.spawn_count(rng, 8 + level, total_span, overlap)):
+            x = rng.randint(lo, hi - 1)
+            y = rng.randint(150, ground_y - 200)
+            item_type = rng.choice(list(ItemType))
+            item = Item(x, y, item_type, rng)
+            item.chunk_key = (index, i)
+            if item.chunk_key not in self.collected_items:
+                chunk.items.append(item)
+
+        return chunk
+
+# Level Prefetcher (builds the next level on a worker thread)
+class LevelPrefetcher:
+    def __init__(self):
+        self.thread = None
+        self.pending = None
+        self.result = None
+        self.error = None
+        self.generation_ms = 0.0
+
+    def start(self, level_number, endless, seed):
+        if self.pending == (level_number, endless, seed):
+            return
+        self.wait()
+        self.pending = (level_number, endless, seed)
+        self.result = None
+        self.error = None
+        self.thread = threading.Thread(target=self.generate, args=self.pending, daemon=True)
+        self.thread.start()
+
+    def generate(self, level_number, endless, seed):
+        start = time.perf_counter()
+        try:
+            level = LevelGenerator(level_number, endless, seed)
+        except Exception as error:
+            # A worker thread would swallow this; take() re-raises it on the game thread
+            self.error = error
+            return
+        self.generation_ms = (time.perf_counter() - start) * 1000
+        self.result = level
+
+    def wait(self):
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+
+    def take(self, level_number, endless, seed):
+        # Hand over the prefetched level, or build it now if it was never requested
+        self.wait()
+        if self.pending != (level_number, endless, seed):
+            self.generate(level_number, endless, seed)
+        level, error = self.result, self.error
+        self.pending = None
+        self.result = None
+        self.error = None
+        if error is not None:
+            raise error
+        return level
+
+# Terrain Cache (static platforms baked into one surface per level chunk)
+class TerrainCache:
+    def __init__(self):
+        self.level = None
+        self.surfaces = {}
+        self.known_chunks = set()
+
+    def reset(self, level):
+        self.level = level
+        self.surfaces = {}
+        self.known_chunks = set(level.chunks)
+        for index in level.chunks:
+            self.bake(index)
+
+    def invalidate(self, index):
+        self.surfaces.pop(index, None)
+
+    def invalidate_platform(self, platform):
+        for index in range(int(platform.x // CHUNK_WIDTH), int((platform.x + platform.width - 1) // CHUNK_WIDTH) + 1):
+            self.invalidate(index)
+
+    def sync_chunks(self):
+        # A chunk's platforms can spill into the next chunk's surface, so both are rebaked
+        chunks = set(self.level.chunks)
+        if chunks != self.known_chunks:
+            for index in chunks ^ self.known_chunks:
+                self.invalidate(index)
+                self.invalidate(index + 1)
+            for index in list(self.surfaces):
+                if index not in chunks:
+                    del self.surfaces[index]
+            self.known_chunks = chunks
+
+    def bake(self, index):
+        surface = pygame.Surface((CHUNK_WIDTH, SCREEN_HEIGHT)).convert()
+        surface.fill(BLACK)
+        left = index * CHUNK_WIDTH
+        area = pygame.Rect(left, 0, CHUNK_WIDTH, SCREEN_HEIGHT)
+        for platform in self.level.platform_grid.query(area):
+            if platform.is_static():
+                pygame.draw.rect(surface, platform.get_color(),
+                                 (platform.x - left, platform.y, platform.width, platform.height))
+        surface.set_colorkey(BLACK, pygame.RLEACCEL)
+        self.surfaces[index] = surface
+        return surface
+
+    def draw(self, screen, camera_x, camera_y):
+        self.sync_chunks()
+        # Rounding up matches how pygame truncates per-platform rects at positive screen positions
+        offset_x = math.ceil(camera_x)
+        offset_y = math.ceil(camera_y)
+        first = int(camera_x // CHUNK_WIDTH)
+        last = int((camera_x + SCREEN_WIDTH - 1) // CHUNK_WIDTH)
+        for index in range(first, last + 1):
+            if index not in self.level.chunks:
+                continue
+            surface = self.surfaces.get(index)
+            if surface is None:
+                surface = self.bake(index)
+            screen.blit(surface, (index * CHUNK_WIDTH - offset_x, -offset_y))
+
+# Background Layer (baked once, blitted every frame)
+class BackgroundLayer:
+    def __init__(self, parallax=PARALLAX_BACKGROUND):
+        self.surface = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT)).convert()
+
+        # Create gradient background
+        for y in range(SCREEN_HEIGHT):
+            color_value = int(20 + (y / SCREEN_HEIGHT) * 30)
+            color = (color_value, 0, color_value)
+            pygame.draw.line(self.surface, color, (0, y), (SCREEN_WIDTH, y))
+
+        # Draw stars (private RNG so gameplay randomness is untouched)
+        self.draw_stars(self.surface, random.Random(42), 100, WHITE)
+
+        self.parallax_layers = []
+        if parallax:
+            self.add_parallax_layer(self.create_star_layer(7, 60, (120, 100, 160)), 0.1)
+
+    def draw_stars(self, surface, rng, count, color, width=SCREEN_WIDTH):
+        for _ in range(count):
+            x = rng.randint(0, width)
+            y = rng.randint(0, SCREEN_HEIGHT // 2)
+            pygame.draw.circle(surface, color, (x, y), 1)
+
+    def create_star_layer(self, seed, count, color):
+        layer = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT // 2)).convert()
+        layer.fill(BLACK)
+        self.draw_stars(layer, random.Random(seed), count, color)
+        return layer
+
+    def add_parallax_layer(self, layer, factor):
+        # Tile the layer twice so any scroll offset is a single blit
+        width, height = layer.get_size()
+        tiled = pygame.Surface((width * 2, height)).convert()
+        tiled.blit(layer, (0, 0))
+        tiled.blit(layer, (width, 0))
+        tiled.set_colorkey(BLACK, pygame.RLEACCEL)
+        self.parallax_layers.append((tiled, width, factor))
+
+    def draw(self, screen, camera_x):
+        screen.blit(self.surface, (0, 0))
+        for tiled, width, factor in self.parallax_layers:
+            offset = int(camera_x * factor) % width
+            screen.blit(tiled, (0, 0), pygame.Rect(offset, 0, SCREEN_WIDTH, tiled.get_height()))
 
 # Game Class
 class Game:
-    def __init__(self):
+    def __init__(self, input_source=None, endless=False, dirty_rects=False, speed=1.0, max_fps=MAX_RENDER_FPS):
+        self.input_source = input_source if input_source is not None else KeyboardInput()
+        self.endless = endless
+        self.dirty_rects = dirty_rects
+        self.speed = speed  # simulated seconds per real second; above 1 fast-forwards
+        self.max_fps = max_fps  # render cap, 0 for uncapped
+        self.full_redraw = True
+        self.last_camera = None
+        self.frame_rects = []
+        self.previous_rects = []
         self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
         pygame.display.set_caption("Hello World Roguelike Platformer")
         self.clock = pygame.time.Clock()
-        self.font = pygame.font.Font(None, 36)
-        self.small_font = pygame.font.Font(None, 24)
+        self.game_over_overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+        self.game_over_overlay.set_alpha(128)
+        self.game_over_overlay.fill(BLACK)
+        self.background = BackgroundLayer()
+        self.sprite_atlas = SpriteAtlas.get()
+        self.terrain = TerrainCache()
+        self.profiler = FrameProfiler()
+        self.prefetcher = LevelPrefetcher()
+        self.show_perf = False
 
         self.reset_game()
 
     def reset_game(self):
         self.current_level = 1
+        self.run_seed = self.input_source.next_seed()
         self.player = Player(100, 400)
-        self.camera_x = 0
-        self.camera_y = 0
+        self.snap_camera()
         self.score = 0
         self.game_over = False
         self.particle_system = ParticleSystem()
-        self.projectiles = []
+        self.projectiles = ProjectilePool()
+        self.enemy_manager = EnemyManager()
         self.load_level()
 
+    def level_seed(self, level_number):
+        # Every level of a run is derived from the run seed, so prefetching can't change it
+        return (self.run_seed * 1000033 + level_number) % 2 ** 32
+
     def load_level(self):
-        self.level = LevelGenerator(self.current_level)
+        self.level = self.prefetcher.take(self.current_level, self.endless, self.level_seed(self.current_level))
+        self.profiler.record("level_gen", self.prefetcher.generation_ms)
+        self.terrain.reset(self.level)
+
+    def prefetch_next_level(self):
+        next_level = self.current_level + 1
+        self.prefetcher.start(next_level, self.endless, self.level_seed(next_level))
 
     def handle_events(self):
         events = []
@@ -582,165 +1758,214 @@ class Game:
             elif event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_r and self.game_over:
                     self.reset_game()
+                elif event.key == pygame.K_F3:
+                    self.show_perf = not self.show_perf
                 elif event.key == pygame.K_ESCAPE:
                     return None
         return events
 
-    def update(self):
+    def update(self, events=()):
         if self.game_over:
             return
+        self.prev_camera = (self.camera_x, self.camera_y)
 
-        # Get events for player input
-        events = self.handle_events()
-        if events is None:  # Quit game
-            return
+        # Read player input for this tick
+        controls = self.input_source.poll(events)
 
-        # Update player with events
-        if not self.player.update(self.level.platforms, self.level.enemies, self.projectiles, events):
+        # Update player with controls
+        if not self.player.update(self.level.platform_grid, self.level.enemy_grid, self.projectiles, controls):
             # Player died - game over (roguelike permanent death)
             self.game_over = True
             self.particle_system.create_explosion(self.player.x + self.player.width // 2,
                                                 self.player.y + self.player.height // 2,
                                                 RED, 50)
+        self.profiler.lap("player")
 
-        # Update enemies and get new projectiles
-        new_projectiles = []
-        for enemy in self.level.enemies:
-            projectile = enemy.update(self.player, self.level.platforms)
-            if projectile:
-                new_projectiles.append(projectile)
-        self.projectiles.extend(new_projectiles)
+        # Update enemies and fire their new shots into the pool
+        self.enemy_manager.update(self.level.enemies, self.player, self.level.platform_grid,
+                                  self.level.enemy_grid, self.projectiles)
+        self.profiler.lap("enemies")
 
-        # Update projectiles
-        self.projectiles = [p for p in self.projectiles if p.update()]
+        # Update projectiles; shots that hit a platform burst into sparks
+        for x, y in self.projectiles.update(self.level.platform_grid):
+            self.particle_system.create_explosion(x, y, RED, 6)
+        self.profiler.lap("projectiles")
 
         # Update items and check collection
-        for item in self.level.items[:]:
-            if not item.collected:
-                item.update()
-                if self.player.get_rect().colliderect(item.get_rect()):
-                    item.collect(self.player)
-                    self.score += 100
-                    self.particle_system.create_explosion(item.x + item.width // 2,
-                                                        item.y + item.height // 2,
-                                                        YELLOW, 15)
-                    self.level.items.remove(item)
-
-        # Update platforms
-        for platform in self.level.platforms:
+        for item in self.level.items:
+            item.update()
+
+        player_rect = self.player.get_rect()
+        for item in self.level.item_grid.query(player_rect):
+            if not item.collected and player_rect.colliderect(item.get_rect()):
+                item.collect(self.player)
+                self.score += 100
+                self.particle_system.create_explosion(item.x + item.width // 2,
+                                                    item.y + item.height // 2,
+                                                    YELLOW, 15)
+                self.level.remove_item(item)
+        self.profiler.lap("items")
+
+        # Update platforms (only fake platforms change; falling ones move cells)
+        for platform in self.level.fake_platforms:
+            was_static = platform.is_static()
             platform.update(self.player)
+            if was_static and not platform.is_static():
+                self.terrain.invalidate_platform(platform)  # draw it per frame from now on
+            if platform.falling:
+                self.level.platform_grid.update(platform)
+        self.profiler.lap("platforms")
 
         # Update particle system
         self.particle_system.update()
+        self.profiler.lap("particles")
 
-        # Update camera to follow player
-        self.camera_x = self.player.x - SCREEN_WIDTH // 2
-        self.camera_y = self.player.y - SCREEN_HEIGHT // 2
+        # Update camera to follow player, snapped to whole pixels so resting on a platform
+        # (which nudges player.y by a fraction every other tick) doesn't scroll the view
+        self.camera_x = int(self.player.x) - SCREEN_WIDTH // 2
+        self.camera_y = int(self.player.y) - SCREEN_HEIGHT // 2
 
-        # Check if player reached end of level
-        if self.player.x > self.level.level_width - 100:
+        # Stream level sections in and out around the camera
+        self.level.update_chunks(self.camera_x)
+
+        # Build the next level in the background, then swap it in at the end
+        if self.level.level_width is not None and self.player.x > self.level.level_width * PREFETCH_AT:
+            self.prefetch_next_level()
+        if self.level.level_width is not None and self.player.x > self.level.level_width - 100:
             self.current_level += 1
             self.score += 1000
             self.load_level()
             self.player.x = 100
             self.player.y = 400
+            self.player.snap()
+            self.snap_camera()
 
         # Check if player fell off the world
         if self.player.y > SCREEN_HEIGHT + 200:
             self.game_over = True
+        self.profiler.lap("level")
 
-    def draw_background(self):
-        # Create gradient background
-        for y in range(SCREEN_HEIGHT):
-            color_value = int(20 + (y / SCREEN_HEIGHT) * 30)
-            color = (color_value, 0, color_value)
-            pygame.draw.line(self.screen, color, (0, y), (SCREEN_WIDTH, y))
+    def snap_camera(self):
+        # Centre the camera on the player with nothing to interpolate from
+        self.camera_x = int(self.player.x) - SCREEN_WIDTH // 2
+        self.camera_y = int(self.player.y) - SCREEN_HEIGHT // 2
+        self.prev_camera = (self.camera_x, self.camera_y)
+        self.view_x, self.view_y = self.camera_x, self.camera_y
 
-        # Draw stars
-        random.seed(42)  # Fixed seed for consistent stars
-        for _ in range(100):
-            x = random.randint(0, SCREEN_WIDTH)
-            y = random.randint(0, SCREEN_HEIGHT // 2)
-            pygame.draw.circle(self.screen, WHITE, (x, y), 1)
-        random.seed()  # Reset seed
+    def render_camera(self, alpha):
+        prev_x, prev_y = self.prev_camera
+        return (int(prev_x + (self.camera_x - prev_x) * alpha),
+                int(prev_y + (self.camera_y - prev_y) * alpha))
+
+    def draw_background(self):
+        self.background.draw(self.screen, self.view_x)
 
     def draw_ui(self):
+        rects = self.frame_rects
         # Draw health bar
-        health_text = self.font.render("Health:", True, WHITE)
-        self.screen.blit(health_text, (10, 10))
+        health_text = text_cache.render("Health:", 36, WHITE)
+        rects.append(self.screen.blit(health_text, (10, 10)))
 
         for i in range(self.player.health):
-            pygame.draw.rect(self.screen, RED, (120 + i * 35, 15, 30, 25))
+            rects.append(pygame.draw.rect(self.screen, RED, (120 + i * 35, 15, 30, 25)))
 
         # Draw score
-        score_text = self.font.render(f"Score: {self.score}", True, WHITE)
-        self.screen.blit(score_text, (10, 50))
+        score_text = text_cache.render(f"Score: {self.score}", 36, WHITE)
+        rects.append(self.screen.blit(score_text, (10, 50)))
 
         # Draw level
-        level_text = self.font.render(f"Hello Level {self.current_level}", True, CYAN)
-        self.screen.blit(level_text, (SCREEN_WIDTH - 250, 10))
+        level_text = text_cache.render(f"Hello Level {self.current_level}", 36, CYAN)
+        rects.append(self.screen.blit(level_text, (SCREEN_WIDTH - 250, 10)))
 
         # Draw power-up indicators
         if self.player.invincible > 0:
-            inv_text = self.small_font.render(f"INVINCIBLE: {self.player.invincible // 60 + 1}s", True, CYAN)
-            self.screen.blit(inv_text, (10, 90))
+            inv_text = text_cache.render(f"INVINCIBLE: {self.player.invincible // 60 + 1}s", 24, CYAN)
+            rects.append(self.screen.blit(inv_text, (10, 90)))
 
         if self.player.speed_boost > 0:
-            speed_text = self.small_font.render(f"SPEED: {self.player.speed_boost // 60 + 1}s", True, YELLOW)
-            self.screen.blit(speed_text, (10, 115))
+            speed_text = text_cache.render(f"SPEED: {self.player.speed_boost // 60 + 1}s", 24, YELLOW)
+            rects.append(self.screen.blit(speed_text, (10, 115)))
 
         if self.player.double_jump_available:
-            jump_text = self.small_font.render("DOUBLE JUMP READY", True, PURPLE)
-            self.screen.blit(jump_text, (10, 140))
+            jump_text = text_cache.render("DOUBLE JUMP READY", 24, PURPLE)
+            rects.append(self.screen.blit(jump_text, (10, 140)))
 
     def draw_game_over(self):
-        overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
-        overlay.set_alpha(128)
-        overlay.fill(BLACK)
-        self.screen.blit(overlay, (0, 0))
+        self.screen.blit(self.game_over_overlay, (0, 0))
 
-        game_over_text = self.font.render("SYNTAX ERROR - GAME OVER", True, RED)
+        game_over_text = text_cache.render("SYNTAX ERROR - GAME OVER", 36, RED)
         text_rect = game_over_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 - 50))
         self.screen.blit(game_over_text, text_rect)
 
-        score_text = self.font.render(f"Final Score: {self.score}", True, WHITE)
+        score_text = text_cache.render(f"Final Score: {self.score}", 36, WHITE)
         score_rect = score_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2))
         self.screen.blit(score_text, score_rect)
 
-        restart_text = self.font.render("Press R to Restart (Back to Level 1)", True, WHITE)
+        restart_text = text_cache.render("Press R to Restart (Back to Level 1)", 36, WHITE)
         restart_rect = restart_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 50))
         self.screen.blit(restart_text, restart_rect)
 
-        permadeath_text = self.small_font.render("Roguelike Mode: Permadeath Activated - All Progress Lost", True, RED)
+        permadeath_text = text_cache.render("Roguelike Mode: Permadeath Activated - All Progress Lost", 24, RED)
         death_rect = permadeath_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 100))
         self.screen.blit(permadeath_text, death_rect)
 
-    def draw(self):
-        # Draw background
-        self.draw_background()
-
-        # Draw game objects
-        for platform in self.level.platforms:
-            if -platform.width < platform.x - self.camera_x < SCREEN_WIDTH:
-                platform.draw(self.screen, self.camera_x, self.camera_y)
-
-        for item in self.level.items:
-            if -item.width < item.x - self.camera_x < SCREEN_WIDTH:
-                item.draw(self.screen, self.camera_x, self.camera_y)
-
-        for enemy in self.level.enemies:
-            if -enemy.width < enemy.x - self.camera_x < SCREEN_WIDTH:
-                enemy.draw(self.screen, self.camera_x, self.camera_y)
+    def draw(self, alpha=1.0):
+        # Render the world between the last two ticks; alpha is how far past the older one we are
+        if self.game_over:
+            alpha = 1.0  # nothing ticks after death, so hold the final positions
+        cx, cy = self.view_x, self.view_y = self.render_camera(alpha)
 
-        for projectile in self.projectiles:
-            if -projectile.width < projectile.x - self.camera_x < SCREEN_WIDTH:
-                projectile.draw(self.screen, self.camera_x, self.camera_y)
+        # Everything drawn over the static scene records its screen rect here
+        self.full_redraw = self.needs_full_redraw()
+        self.frame_rects = []
+        rects = self.frame_rects
 
-        # Draw player
-        self.player.draw(self.screen, self.camera_x, self.camera_y)
+        # Draw background, or only repaint it where last frame's sprites were
+        if self.full_redraw:
+            self.draw_background()
+        else:
+            for rect in self.previous_rects:
+                self.screen.set_clip(rect)
+                self.draw_background()
+                self.terrain.draw(self.screen, cx, cy)
+            self.screen.set_clip(None)
+        self.profiler.lap("draw_background")
+
+        # Only entities overlapping the camera rectangle are touched below
+        view = self.view_rect()
+
+        # Draw static terrain from the chunk cache, then triggered fake platforms
+        if self.full_redraw:
+            self.terrain.draw(self.screen, cx, cy)
+        for platform in self.level.fake_index.query(view):
+            if not platform.is_static():
+                rects.append(platform.draw(self.screen, cx, cy))
+        self.profiler.lap("draw_platforms")
+
+        # Draw items, enemies, projectiles and the player as one batch of atlas blits
+        atlas = self.sprite_atlas
+        batch = []
+        for item in self.level.item_index.query(view.inflate(0, ITEM_BOB_MARGIN * 2)):
+            batch.append(item.sprite_entry(atlas, cx, cy))
+
+        for enemy in self.level.enemy_grid.query(view):
+            if view.colliderect(enemy.get_rect()):
+                batch.append(enemy.sprite_entry(atlas, cx, cy, alpha))
+
+        batch.extend(self.projectiles.sprite_entries(atlas, cx, cy, alpha))
+
+        batch.append(self.player.sprite_entry(atlas, cx, cy, alpha))
+        if self.dirty_rects:
+            rects.extend(self.screen.blits(batch))
+        else:
+            self.screen.blits(batch, doreturn=False)
+        self.profiler.lap("draw_sprites")
 
         # Draw particles
-        self.particle_system.draw(self.screen, self.camera_x, self.camera_y)
+        particle_rect = self.particle_system.draw(self.screen, cx, cy)
+        if particle_rect:
+            rects.append(particle_rect)
+        self.profiler.lap("draw_particles")
 
         # Draw UI
         self.draw_ui()
@@ -761,32 +1986,217 @@ class Game:
             ]
 
             for i, instruction in enumerate(instructions):
-                inst_text = self.small_font.render(instruction, True, YELLOW)
-                self.screen.blit(inst_text, (SCREEN_WIDTH // 2 - 200, SCREEN_HEIGHT // 2 - 100 + i * 30))
+                inst_text = text_cache.render(instruction, 24, YELLOW)
+                rects.append(self.screen.blit(inst_text, (SCREEN_WIDTH // 2 - 200, SCREEN_HEIGHT // 2 - 100 + i * 30)))
+        self.profiler.lap("draw_ui")
+
+        # Draw performance overlay
+        if self.show_perf:
+            rects.append(self.profiler.draw_overlay(self.screen, (SCREEN_WIDTH - 260, 50)))
+
+    def needs_full_redraw(self):
+        # A scrolling camera, new level or the dimmed game over screen changes every pixel
+        camera = (self.view_x, self.view_y, self.level, self.game_over)
+        moved = camera != self.last_camera
+        self.last_camera = camera
+        return (not self.dirty_rects or moved or self.game_over
+                or len(self.previous_rects) > DIRTY_RECT_LIMIT)
+
+    def present(self):
+        # Push the frame to the window: whole screen, or just the rects that changed
+        if self.full_redraw:
+            pygame.display.flip()
+        else:
+            pygame.display.update(self.previous_rects + self.frame_rects)
+        self.previous_rects = self.frame_rects
+
+    def view_rect(self):
+        # Camera rectangle in world coordinates
+        return pygame.Rect(self.view_x, self.view_y, SCREEN_WIDTH + 1, SCREEN_HEIGHT + 1)
+
+    def entity_counts(self):
+        return {
+            "platforms": len(self.level.platforms),
+            "enemies": len(self.level.enemies),
+            "enemies_awake": self.enemy_manager.tier_counts[0] + self.enemy_manager.tier_counts[1],
+            "items": len(self.level.items),
+            "projectiles": len(self.projectiles),
+            "particles": len(self.particle_system),
+        }
 
     def run(self):
-        running = True
-        while running:
+        # Fixed-timestep loop: the simulation ticks at TICK_RATE no matter how fast we render
+        accumulator = 0.0
+        pending_events = []
+        last_time = time.perf_counter()
+        while True:
+            self.profiler.begin_frame()
+
             # Get events and check if we should continue
             events = self.handle_events()
             if events is None:
                 break
+            pending_events.extend(events)
+            self.profiler.lap("events")
+
+            now = time.perf_counter()
+            accumulator += (now - last_time) * self.speed
+            last_time = now
+
+            # Run every tick that is due, but never more than the catch-up cap per frame
+            max_ticks = MAX_CATCH_UP_TICKS * max(1, int(self.speed))
+            ticks = 0
+            while accumulator >= TICK_SECONDS and ticks < max_ticks:
+                # Replays restart on their own after each recorded death
+                if self.input_source.finished:
+                    break
+                if self.game_over and self.input_source.replaying:
+                    self.reset_game()
 
-            self.update()
-            self.draw()
-            pygame.display.flip()
-            self.clock.tick(FPS)
+                self.update(pending_events)
+                pending_events = []
+                accumulator -= TICK_SECONDS
+                ticks += 1
+            if self.input_source.finished:
+                break
+            if ticks == max_ticks:
+                accumulator = min(accumulator, TICK_SECONDS)  # too far behind: slow down instead of spiralling
+
+            self.draw(min(accumulator / TICK_SECONDS, 1.0))
+            self.present()
+            self.profiler.lap("flip")
+            self.profiler.end_frame(self.entity_counts())
+            self.clock.tick(self.max_fps)
+
+        self.input_source.close(self)
+        self.profiler.close_log()
+
+    def replay_state(self):
+        # Compact fingerprint of the game state, compared after a replay
+        return {
+            "level": self.current_level,
+            "score": self.score,
+            "game_over": self.game_over,
+            "player": [round(self.player.x, 3), round(self.player.y, 3)],
+        }
+
+    def run_headless(self, ticks=None, render=False, restart_on_death=True):
+        # Simulate as fast as possible, without the frame cap; ticks=None runs until the input ends
+        ticks_run = 0
+        deaths = 0
+        start = time.perf_counter()
+        while ticks is None or ticks_run < ticks:
+            if self.input_source.finished:
+                break
+            if self.game_over:
+                if not restart_on_death:
+                    break
+                deaths += 1
+                self.reset_game()
 
-        pygame.quit()
-        sys.exit()
+            self.profiler.begin_frame()
+            self.update()
+            if render:
+                self.draw()
+            self.profiler.end_frame(self.entity_counts())
+            ticks_run += 1
+        elapsed = time.perf_counter() - start
+
+        return {
+            "ticks": ticks_run,
+            "seconds": elapsed,
+            "ticks_per_second": ticks_run / elapsed if elapsed > 0 else float("inf"),
+            "level": self.current_level,
+            "score": self.score,
+            "deaths": deaths,
+        }
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Hello World Roguelike Platformer", allow_abbrev=False)
+    parser.add_argument("--headless", type=int, metavar="TICKS",
+                        help="simulate TICKS updates without a window and report ticks per second")
+    parser.add_argument("--render", action="store_true",
+                        help="also draw every tick in headless mode")
+    parser.add_argument("--jump-every", type=int, default=45,
+                        help="scripted input for headless mode: hold right and jump every N ticks")
+    parser.add_argument("--seed", type=int, help="seed the game RNG for repeatable runs")
+    parser.add_argument("--endless", action="store_true",
+                        help="one unbounded level that keeps streaming new sections")
+    parser.add_argument("--perf-log", metavar="PATH",
+                        help="append per-frame phase timings to PATH as JSON lines")
+    parser.add_argument("--speed", type=float, default=1.0,
+                        help="simulation speed multiplier; e.g. 4 runs four ticks per 1/60 s")
+    parser.add_argument("--max-fps", type=int, default=MAX_RENDER_FPS,
+                        help="render frame cap (0 = uncapped); the simulation stays at 60 ticks/s")
+    parser.add_argument("--dirty-rects", action="store_true",
+                        help="only push changed screen regions while the camera is still")
+    parser.add_argument("--record", metavar="PATH",
+                        help="save run seeds and per-tick input to PATH when the game ends")
+    parser.add_argument("--replay", metavar="PATH",
+                        help="play back a recorded log, uncapped and without rendering")
+    parser.add_argument("--realtime", action="store_true",
+                        help="play the replay in a window at normal speed")
+    return parser.parse_args(argv)
+
+def run_headless(args):
+    input_source = ScriptedInput.run_and_jump(args.jump_every)
+    if args.record:
+        input_source = InputRecorder(input_source, args.record)
+    game = Game(input_source, endless=args.endless)
+    if args.perf_log:
+        game.profiler.open_log(args.perf_log)
+    stats = game.run_headless(args.headless, render=args.render)
+    game.input_source.close(game)
+    game.profiler.close_log()
+    print(f"Headless: {stats['ticks']} ticks in {stats['seconds']:.2f}s "
+          f"({stats['ticks_per_second']:.0f} ticks/s), "
+          f"reached level {stats['level']}, score {stats['score']}, deaths {stats['deaths']}")
+    for phase, (p50, p99) in game.profiler.summary().items():
+        print(f"  {phase:<16} p50 {p50:7.3f} ms   p99 {p99:7.3f} ms")
+    pygame.quit()
+
+def run_replay(args):
+    replay = ReplayInput.load(args.replay)
+    game = Game(replay, endless=replay.endless, dirty_rects=args.dirty_rects,
+                speed=args.speed, max_fps=args.max_fps)
+    if args.perf_log:
+        game.profiler.open_log(args.perf_log)
+    if args.realtime:
+        game.run()  # returns when the log runs out or the window is closed
+        print(f"Replay: reached level {game.current_level}, score {game.score}")
+    else:
+        stats = game.run_headless(render=args.render)
+        print(f"Replay: {stats['ticks']} ticks in {stats['seconds']:.2f}s "
+              f"({stats['ticks_per_second']:.0f} ticks/s), "
+              f"reached level {stats['level']}, score {stats['score']}, deaths {stats['deaths']}")
+    game.profiler.close_log()
+    if not replay.finished:
+        print("Replay stopped before the end of the recording")
+    elif replay.final is not None:
+        print("Final state matches the recording" if game.replay_state() == replay.final
+              else f"Final state differs: recorded {replay.final}, replayed {game.replay_state()}")
+    for phase, (p50, p99) in game.profiler.summary().items():
+        print(f"  {phase:<16} p50 {p50:7.3f} ms   p99 {p99:7.3f} ms")
+    pygame.quit()
 
 # Main execution
 if __name__ == "__main__":
+    args = parse_args()
+    if args.seed is not None:
+        random.seed(args.seed)
+    if args.replay:
+        run_replay(args)
+        sys.exit()
+    if args.headless is not None:
+        run_headless(args)
+        sys.exit()
+
     print("Starting Hello World Roguelike Platformer...")
     print("Controls:")
     print("- Arrow Keys: Move left/right")
     print("- Space: Jump (double jump available)")
     print("- R: Restart when game over")
+    print("- F3: Toggle performance overlay")
     print("- ESC: Quit")
     print("\nGame Features:")
     print("- Roguelike: Permadeath, procedural levels")
@@ -796,5 +2206,9 @@ if __name__ == "__main__":
     print("- Progressive difficulty")
     print("\nStarting game...")
 
-    game = Game()
-    game.run()
\ No newline at end of file
+    game = Game(InputRecorder(KeyboardInput(), args.record) if args.record else None,
+                endless=args.endless, dirty_rects=args.dirty_rects, speed=args.speed, max_fps=args.max_fps)
+    if args.perf_log:
+        game.profiler.open_log(args.perf_log)
+    game.run()
+    pygame.quit()
\ No newline at end of file
@@ -0,0 +1,307 @@
+#!/usr/bin/env python3
+
+import os
+import sys
+sys.path.append('.')
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+try:
+    # Test imports
+    import pygame
+
+    # Test our game imports
+    from hello_world_roguelike import Game, Player, Enemy, Platform, LevelGenerator, LevelPrefetcher, SpatialHash, SortedIndex, ParticleSystem, ProjectilePool, EnemyManager, CHUNK_WIDTH, ScriptedInput, InputState, InputRecorder, ReplayInput, SpriteAtlas, text_cache, EnemyType, ItemType
+
+    print("✓ All imports successful")
+
+    # Test game initialization
+    game = Game()
+    print("✓ Game initialized successfully")
+
+    # Test level generation and spatial index
+    level = LevelGenerator(30)
+    assert len(level.platform_grid) == len(level.platforms)
+    assert len(level.enemy_grid) == len(level.enemies)
+    assert len(level.item_grid) == len(level.items) == len(level.item_index)
+    assert all(p.platform_type == "fake" for p in level.fake_platforms)
+    print(f"✓ Level 30 generated: {len(level.platforms)} platforms, {len(level.enemies)} enemies, {len(level.items)} items")
+
+    # Test chunk streaming, eviction and deterministic regeneration
+    endless = LevelGenerator(1, endless=True, seed=7)
+    first_layout = [(p.x, p.y, p.width, p.platform_type) for p in endless.chunks[0].platforms]
+    endless.update_chunks(200000)
+    assert 0 not in endless.chunks and min(endless.chunks) > 190
+    assert len(endless.chunks) <= 4 and len(endless.platform_grid) == len(endless.platforms)
+    endless.update_chunks(0)
+    assert [(p.x, p.y, p.width, p.platform_type) for p in endless.chunks[0].platforms] == first_layout
+    item = endless.items[0]
+    endless.remove_item(item)
+    endless.update_chunks(200000)
+    endless.update_chunks(0)
+    assert item.chunk_key not in [i.chunk_key for i in endless.items]
+
+    # Evicting and reloading a chunk keeps what happened in it
+    fake = next(p for p in endless.chunks[0].platforms if p.platform_type == "fake")
+    fake.triggered, fake.falling, fake.timer, fake.y = True, True, 40, fake.y + 90
+    stayed, wandered = endless.chunks[0].enemies
+    stayed.x, stayed.y = 500, 300
+    wandered.x = CHUNK_WIDTH + 100
+    endless.update_chunks(CHUNK_WIDTH * 2)
+    assert 0 not in endless.chunks and wandered in endless.enemies and stayed not in endless.enemies
+    endless.update_chunks(0)
+    assert fake in endless.chunks[0].platforms and fake.falling and fake.timer == 40
+    assert stayed in endless.enemies and (stayed.x, stayed.y) == (500, 300)
+    assert wandered in endless.enemies and len(endless.enemies) == len(endless.enemy_grid) == 6
+    endless.update_chunks(200000)
+    endless.update_chunks(0)
+    assert stayed in endless.enemies and wandered in endless.enemies and wandered.x == CHUNK_WIDTH + 100
+    assert len(endless.enemies) == len(endless.enemy_grid) == 6
+    print(f"✓ Chunk streaming successful: {len(endless.chunks)} chunks live")
+
+    # Test that a prefetched level matches one generated in place
+    prefetcher = LevelPrefetcher()
+    prefetcher.start(4, False, 99)
+    prefetched = prefetcher.take(4, False, 99)
+    in_place = LevelGenerator(4, seed=99)
+    assert [(p.x, p.y, p.width) for p in prefetched.platforms] == [(p.x, p.y, p.width) for p in in_place.platforms]
+    assert prefetched.level_number == 4 and prefetcher.generation_ms > 0
+    prefetcher.start("bad", False, 99)  # fails on the worker thread
+    try:
+        prefetcher.take("bad", False, 99)
+        assert False, "generation error was swallowed"
+    except TypeError:
+        pass
+    assert prefetcher.take(4, False, 99).level_number == 4
+    print(f"✓ Level prefetch successful: {prefetcher.generation_ms:.1f} ms")
+
+    # Test spatial hash queries
+    grid = SpatialHash()
+    near = Platform(100, 600, 200, 20)
+    far = Platform(2000, 600, 200, 20)
+    grid.insert(near)
+    grid.insert(far)
+    assert grid.query(pygame.Rect(150, 590, 30, 40)) == [near]
+    far.y = 100
+    grid.update(far)
+    assert grid.query(pygame.Rect(2050, 90, 30, 40)) == [far]
+    assert grid.query(pygame.Rect(2050, 590, 30, 40)) == []
+    grid.remove(near)
+    assert len(grid) == 1 and not grid.query(near.get_rect())
+    print("✓ Spatial hash insert/update/query/remove successful")
+
+    # Test sorted index viewport queries on both axes
+    index = SortedIndex([Platform(x, 600, 100, 20) for x in range(0, 10000, 50)] + [Platform(5000, 100, 100, 20)])
+    view = pygame.Rect(2020, 500, 200, 200)
+    assert sorted(p.x for p in index.query(view)) == [1950, 2000, 2050, 2100, 2150, 2200]
+    assert [p.y for p in index.query(pygame.Rect(4990, 0, 50, 200))] == [100]
+    index.remove(index.query(view)[0])
+    assert len(index.query(view)) == 5 and len(index) == 200
+    print("✓ Sorted index successful")
+
+    # Test player landing on a platform through the grid
+    ground = SpatialHash()
+    ground.insert(Platform(0, 600, 400, 20))
+    player = Player(100, 565)
+    player.vy = 5
+    player.check_collisions(ground, False)
+    assert player.on_ground and player.y == 600 - player.height
+    print("✓ Player collision successful")
+
+    # Test swept collisions: fast movers stop at thin platforms instead of tunnelling
+    from hello_world_roguelike import sweep_aabb
+    assert sweep_aabb(0, 0, 10, 10, 0, 40, 0, 20, 10, 5) == (0.25, (0, -1))
+    assert sweep_aabb(0, 0, 10, 10, 0, 5, 0, 20, 10, 5) is None
+    thin = SpatialHash()
+    ledge = Platform(0, 600, 400, 15, "fake")
+    thin.insert(ledge)
+    faller = Player(100, 550)
+    faller.vy = 40
+    faller.move(thin, False)
+    assert faller.on_ground and faller.y == 600 - faller.height and faller.standing_on is ledge
+    shots = ProjectilePool(capacity=4)
+    shots.spawn(100, 560, 0, 60, lifetime=10)
+    assert len(shots.update(thin)) == 1 and len(shots) == 0
+    print("✓ Swept collision successful")
+
+    # Test particle pool allocation and slot recycling
+    particles = ParticleSystem(capacity=64)
+    particles.create_explosion(100, 100, (255, 0, 0), 50)
+    particles.create_trail(100, 100, (0, 255, 0), 30)
+    assert len(particles) == 64  # extra particles are dropped when the pool is full
+    for _ in range(30):
+        particles.update()
+    assert len(particles) == 0 and len(particles.free_slots) == 64
+    particles.create_explosion(100, 100, (255, 0, 0), 10)
+    particles.draw(game.screen, 0, 0)
+    assert len(particles) == 10
+    print("✓ Particle system successful")
+
+    # Test projectile pool firing, collision and expiry
+    pool = ProjectilePool(capacity=4)
+    for i in range(5):
+        pool.spawn(100 + i * 50, 100, 1, 0, lifetime=10)
+    assert len(pool) == 4 and not pool.free_slots
+    hits = pool.collide_rect(pygame.Rect(95, 95, 20, 20))
+    assert hits.tolist() == [0]
+    pool.release(hits)
+    edge = ProjectilePool(capacity=2)
+    target = Player(200, 100).get_rect()
+    edge.spawn(target.left - edge.width // 2 - 1, 110, 0, 0, lifetime=1)  # drawn just left of the player
+    assert edge.collide_rect(target).size == 0
+    edge.spawn(target.left - edge.width // 2 + 1, 110, 0, 0, lifetime=1)
+    assert edge.collide_rect(target).size == 1
+    for _ in range(10):
+        pool.update()
+    assert len(pool) == 0 and len(pool.free_slots) == 4
+    print("✓ Projectile pool successful")
+
+    # Test that ERROR enemies fire at a nearby player
+    shooter = Enemy(300, 600, EnemyType.ERROR)
+    chaser = Enemy(900, 600, EnemyType.BUG)
+    manager = EnemyManager()
+    shots = ProjectilePool(capacity=4)
+    manager.update([shooter, chaser], Player(400, 600), ground, SpatialHash(), shots)
+    assert len(shots) == 1 and shots.vx[shots.active][0] > 0
+    manager.update([chaser, shooter], Player(850, 600), ground, SpatialHash(), shots)
+    manager.write_back()
+    assert chaser.ai_state == "chase" and chaser.vx < 0 and shooter.shoot_cooldown > 0
+    print("✓ Enemy shooting successful")
+
+    # Test activity tiers: near enemies tick, mid-range ones tick coarsely, far ones sleep
+    floor = SpatialHash()
+    floor.insert(Platform(0, 600, 10000, 20))
+    near, middle, far = (Enemy(x, 565, EnemyType.BUG) for x in (600, 2000, 6000))
+    tiers = EnemyManager()
+    for _ in range(8):
+        tiers.update([near, middle, far], Player(100, 560), floor, SpatialHash(), shots)
+    assert tiers.tier_counts == (1, 1, 1) and far.x == 6000 and middle.x != 2000
+    tiers.update(tiers.enemies, Player(5800, 560), floor, SpatialHash(), shots)
+    assert tiers.tier_counts == (1, 0, 2) and not far.sleeping and far.x != 6000 and abs(far.y - 565) < 1
+    print("✓ Enemy activity tiers successful")
+
+    # Test that the per-enemy AI path matches the vectorised one
+    import random
+    crowds = [[Enemy(200 + i * 150, 565, (EnemyType.BUG, EnemyType.ERROR)[i % 2], random.Random(i))
+               for i in range(32)] for _ in range(2)]
+    batch, each = EnemyManager(batch_threshold=0), EnemyManager(batch_threshold=1000)
+    batch_shots, each_shots = ProjectilePool(), ProjectilePool()
+    for tick in range(120):
+        target = Player(300 + tick * 30, 560)
+        batch.update(crowds[0], target, floor, SpatialHash(), batch_shots)
+        each.update(crowds[1], target, floor, SpatialHash(), each_shots)
+    batch.write_back()
+    assert batch.batch and not each.batch and batch.tier_counts == each.tier_counts and len(batch_shots) == len(each_shots) > 0
+    for a, b in zip(*crowds):
+        assert (a.x, a.y, a.vx, a.ai_state, a.shoot_cooldown, a.sleeping) == (b.x, b.y, b.vx, b.ai_state, b.shoot_cooldown, b.sleeping)
+    print("✓ Enemy AI paths match")
+
+    # Test that drawing the background leaves the gameplay RNG alone
+    random.seed(1234)
+    expected = random.random()
+    random.seed(1234)
+    game.draw_background()
+    assert random.random() == expected
+    print("✓ Background layer successful")
+
+    # Test that every entity visual state is baked into the atlas
+    atlas = SpriteAtlas.get()
+    assert len(atlas.areas) == 4 + len(EnemyType) + len(ItemType) + 1
+    for enemy_type in EnemyType:
+        source, dest, area = Enemy(10, 20, enemy_type).sprite_entry(atlas, 0, 0)
+        assert source is atlas.surface and dest == (10, 20) and area.size == (35, 35)
+    print("✓ Sprite atlas successful")
+
+    # Test terrain chunk cache invalidation
+    terrain = game.terrain
+    assert set(terrain.surfaces) <= set(game.level.chunks)
+    fake = Platform(500, 400, 100, 20, "fake")
+    terrain.surfaces[0] = terrain.bake(0)
+    fake.triggered = True
+    terrain.invalidate_platform(fake)
+    assert 0 not in terrain.surfaces and not fake.is_static()
+    terrain.draw(game.screen, game.camera_x, game.camera_y)
+    assert 0 in terrain.surfaces
+    print("✓ Terrain cache successful")
+
+    # Test a few simulated frames
+    for _ in range(60):
+        game.update()
+        game.draw()
+    print("✓ Game update/draw frames successful")
+
+    # Test that dirty-rect frames match a full redraw while the camera is still
+    idle_game = Game(ScriptedInput([InputState()]), dirty_rects=True)
+    for _ in range(150):
+        idle_game.update()
+    idle_game.draw()
+    idle_game.present()
+    for _ in range(10):
+        idle_game.update()
+        idle_game.draw()
+        assert not idle_game.full_redraw
+        idle_game.present()
+    partial = pygame.surfarray.array3d(idle_game.screen)
+    idle_game.dirty_rects = False
+    idle_game.draw()
+    assert (pygame.surfarray.array3d(idle_game.screen) == partial).all()
+    print(f"✓ Dirty-rect mode successful: {len(idle_game.previous_rects)} rects per frame")
+
+    # Test that steady-state frames hit the text cache only
+    stats = text_cache.stats()
+    game.draw()
+    assert text_cache.font_loads == stats["font_loads"]
+    assert text_cache.misses == stats["misses"] and text_cache.hits > stats["hits"]
+    print(f"✓ Text cache successful: {text_cache.stats()}")
+
+    # Test headless fast-forward simulation with scripted input
+    headless_game = Game(ScriptedInput.run_and_jump(30))
+    stats = headless_game.run_headless(300)
+    assert stats["ticks"] == 300 and stats["ticks_per_second"] > 0
+    assert headless_game.player.facing_right
+    headless_game.player.x = headless_game.level.level_width - 50
+    headless_game.update()
+    assert headless_game.current_level == 2 and "level_gen" in headless_game.profiler.summary()
+    print(f"✓ Headless mode successful: {stats['ticks_per_second']:.0f} ticks/s")
+
+    # Test that a recorded run replays to the same final state
+    import tempfile
+    log_path = os.path.join(tempfile.mkdtemp(), "run.json")
+    recorded = Game(InputRecorder(ScriptedInput.run_and_jump(23), log_path))
+    recorded.run_headless(400)
+    recorded.input_source.close(recorded)
+    replay = ReplayInput.load(log_path)
+    replayed = Game(replay)
+    stats = replayed.run_headless()
+    assert stats["ticks"] == 400 and replayed.replay_state() == replay.final
+    print(f"✓ Record/replay successful: {len(replay.seeds)} runs, final state {replay.final}")
+
+    # Test frame profiler percentiles and overlay
+    summary = headless_game.profiler.summary()
+    assert "player" in summary and "total" in summary
+    assert summary["total"][0] <= summary["total"][1]
+    headless_game.show_perf = True
+    headless_game.draw()
+    print("✓ Frame profiler successful")
+
+    # Test interpolated drawing between the last two ticks
+    mover = headless_game.player
+    mover.prev_x, mover.x = 100, 110
+    assert mover.sprite_entry(atlas, 0, 0, 0.5)[1] == (105, mover.y)
+    headless_game.draw(0.25)
+    print("✓ Interpolated draw successful")
+
+    # Test that the fixed-timestep loop replays the same ticks at 8x speed
+    realtime = Game(ReplayInput.load(log_path), speed=8)
+    realtime.run()
+    assert realtime.input_source.finished and realtime.replay_state() == replay.final
+    print("✓ Fixed-timestep loop successful")
+
+    print("\n🎮 All tests passed! The game should run without errors.")
+
+except Exception as e:
+    print(f"❌ Error: {e}")
+    import traceback
+    traceback.print_exc()
+    sys.exit(1)